@@ -4,45 +4,314 @@ Article Generator
 Generates beginner-friendly AI paper explanations using OpenAI API.
 """
 
+import asyncio
+import aiofiles
 import openai
+import orjson
+import tiktoken
+import hashlib
 import json
+import math
 import os
+import sqlite3
+import textwrap
+import time
+from array import array
+from types import MappingProxyType
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
 
+MODEL = "gpt-5-nano"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+SYSTEM_PROMPT = (
+    "You are an expert at explaining complex AI research papers in simple, beginner-friendly terms. "
+    "You use analogies, examples, and clear language to make technical concepts accessible to "
+    "university students new to AI. Always write for that audience: use simple language, avoid "
+    "jargon and mathematical formulas, and prefer analogies and everyday examples."
+)
+
+PROMPT_ALL_SECTIONS = textwrap.dedent("""
+    Explain the paper as a JSON object with exactly these string keys:
+    - "background": 2-3 paragraphs on why the research was needed and what problems existed before it. Focus on the motivation, not the solution.
+    - "methodology": 3-4 paragraphs on WHAT they did and HOW it works conceptually, broken into simple steps. Use numbered lists or bullet points where helpful.
+    - "results": 2-3 paragraphs on what the research achieved, compared to previous methods where relevant, without technical metrics.
+    - "significance": 2-3 paragraphs on why the paper matters today, how it influenced later work, and its links to modern AI systems people know (ChatGPT, etc.).
+    - "concept_title": the single most important technical concept a beginner should understand (2-4 words, e.g. "Self-Attention Mechanism").
+    - "concept_content": 4-5 paragraphs explaining that concept, starting with a simple analogy, then how it works step by step with concrete examples, why it is important and its practical applications.
+    - "summary": one clear sentence summarizing the main contribution, e.g. "This paper introduced [innovation] which [impact], becoming the foundation for [applications]."
+    - "subtitle": an engaging 5-10 word subtitle capturing the main innovation or impact, e.g. "How the Transformer Architecture Revolutionized AI".
+""").strip()
+
+PROMPT_BACKGROUND = textwrap.dedent("""
+    Explain why the research in this paper was needed, in 2-3 paragraphs.
+    Describe what problems existed before it. Focus on the motivation and context, not the solution.
+""").strip()
+
+PROMPT_METHODOLOGY = textwrap.dedent("""
+    Explain the key innovation and methodology of this paper in 3-4 paragraphs.
+    Break the approach into simple steps, using numbered lists or bullet points where helpful.
+    Focus on WHAT they did and HOW it works conceptually, not the technical implementation.
+""").strip()
+
+PROMPT_RESULTS = textwrap.dedent("""
+    Explain the results and achievements of this paper in 2-3 paragraphs.
+    Compare to previous methods if relevant and mention specific improvements, without technical metrics.
+    Focus on the practical impact and what made this work significant.
+""").strip()
+
+PROMPT_SIGNIFICANCE = textwrap.dedent("""
+    Explain why this paper matters today and its long-term significance in AI, in 2-3 paragraphs.
+    Cover how it influenced later developments and the applications and modern AI systems people know (ChatGPT, etc.) that build on it.
+""").strip()
+
+PROMPT_CONCEPT_TITLE = textwrap.dedent("""
+    Identify the single most important technical concept introduced or used in this paper that a beginner should understand.
+    Return only its name (2-4 words), e.g. "Self-Attention Mechanism", "Convolutional Neural Networks", "Adversarial Training".
+""").strip()
+
+PROMPT_CONCEPT_EXPLANATION = textwrap.dedent("""
+    Explain "{concept_title}" as it relates to this paper, in 4-5 paragraphs.
+    Start with a simple analogy, explain how it works step by step with concrete examples, why it is important, and its practical applications.
+    A beginner should be able to explain the concept to someone else afterwards.
+""").strip()
+
+PROMPT_SUMMARY = textwrap.dedent("""
+    Write one clear sentence summarizing the main contribution of this paper.
+    Example format: "This paper introduced [innovation] which [impact], becoming the foundation for [applications]."
+""").strip()
+
+PROMPT_SUBTITLE = textwrap.dedent("""
+    Create an engaging 5-10 word subtitle for a beginner-friendly explanation of this paper, capturing its main innovation or impact.
+    Examples: "How the Transformer Architecture Revolutionized AI", "Two Neural Networks Competing to Create Reality".
+""").strip()
+
+PROMPT_ARTICLES_BATCH = textwrap.dedent("""
+    Explain each of the papers below. Return a JSON object with a single key "articles" holding an array with one object per paper, in the order given.
+    Each object must have an "id" key with the paper's ID exactly as given, and these string keys:
+""").strip() + "\n" + PROMPT_ALL_SECTIONS.split("\n", 1)[1]
+
+# Completion tokens reserved per request when estimating token usage
+GENERATION_TOKEN_BUDGET = 2000
+ALL_SECTIONS_TOKEN_BUDGET = 8000
+
+# Keys returned by the combined single-call prompt
+SECTION_KEYS = (
+    "background", "methodology", "results", "significance",
+    "concept_title", "concept_content", "summary", "subtitle",
+)
+
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Returned in place of a section when the OpenAI call fails
+ERROR_CONTENT_PREFIX = "Error generating content: "
+
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Blog category slug -> display name
+CATEGORY_NAMES = MappingProxyType({
+    'foundation-models': 'Foundation Models',
+    'generative-models': 'Generative Models',
+    'optimization': 'Optimization',
+    'applications': 'Applications',
+    'basic-concepts': 'Basic Concepts'
+})
+
+
+class RateLimiter:
+    """
+    Token bucket over both requests and tokens per minute.
+    
+    Capacity refills continuously at limit/60 per second, capped at the
+    per-minute limit, so sustained traffic stays just under the quota.
+    """
+    
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + elapsed * self.max_requests_per_minute / 60,
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60,
+        )
+    
+    async def acquire(self, req: int = 1, tokens: int = 0):
+        """Wait until both budgets can cover the request, then consume them."""
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+        
+        while True:
+            self._refill()
+            if (self.available_request_capacity >= req and
+                    self.available_token_capacity >= tokens):
+                self.available_request_capacity -= req
+                self.available_token_capacity -= tokens
+                return
+            
+            wait = max(
+                (req - self.available_request_capacity) * 60 / self.max_requests_per_minute,
+                (tokens - self.available_token_capacity) * 60 / self.max_tokens_per_minute,
+                0.01,
+            )
+            await asyncio.sleep(wait)
+
+
+class ResponseCache:
+    """
+    Persistent cache of OpenAI responses stored in SQLite.
+    
+    Responses are keyed by a SHA-256 of the model, messages and response
+    format, so an identical request is never paid for twice. When
+    semantic_threshold is set, a miss also falls back to the stored response
+    whose prompt embedding has the highest cosine similarity, provided it
+    reaches the threshold.
+    """
+    
+    def __init__(self, path: str, semantic_threshold: Optional[float] = None):
+        self.path = path
+        self.semantic_threshold = semantic_threshold
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, embedding BLOB)"
+        )
+        self._conn.commit()
+        self._embeddings = None
+    
+    @staticmethod
+    def make_key(messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+        payload = json.dumps({"model": MODEL, "messages": messages, "response_format": response_format},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def nearest(self, embedding: List[float]) -> Optional[str]:
+        """Return the cached response most similar to embedding, if above the threshold."""
+        if self._embeddings is None:
+            rows = self._conn.execute(
+                "SELECT response, embedding FROM responses WHERE embedding IS NOT NULL"
+            ).fetchall()
+            self._embeddings = []
+            for response, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                self._embeddings.append((vector, response))
+        
+        query = _normalize(embedding)
+        best_score, best_response = -1.0, None
+        for vector, response in self._embeddings:
+            score = sum(a * b for a, b in zip(query, vector))
+            if score > best_score:
+                best_score, best_response = score, response
+        
+        if best_response is not None and best_score >= self.semantic_threshold:
+            return best_response
+        return None
+    
+    def set(self, key: str, response: str, embedding: Optional[List[float]] = None):
+        blob = None
+        if embedding is not None:
+            vector = _normalize(embedding)
+            blob = vector.tobytes()
+            if self._embeddings is not None:
+                self._embeddings.append((vector, response))
+        self._conn.execute("INSERT OR REPLACE INTO responses (key, response, embedding) VALUES (?, ?, ?)",
+                           (key, response, blob))
+        self._conn.commit()
+    
+    def close(self):
+        self._conn.close()
+
+
+def _normalize(embedding: List[float]) -> array:
+    """Scale a vector to unit length so a dot product gives cosine similarity."""
+    norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+    return array("f", (x / norm for x in embedding))
+
+
+def is_error_article(article: Dict) -> bool:
+    """Whether any generated section of an article holds an API error message."""
+    texts = [article.get("subtitle"), article.get("concept_explained"), article.get("summary"),
+             article.get("concept_explanation", {}).get("content")]
+    texts.extend(article.get("content", {}).values())
+    return any(isinstance(text, str) and text.startswith(ERROR_CONTENT_PREFIX) for text in texts)
+
+
+def _serialize_and_write(article: Dict, filename: str):
+    """Serialize an article and write it to disk."""
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(article, option=JSON_OPTIONS))
+
+
 class ArticleGenerator:
-    def __init__(self):
-        # OpenAI API is already configured via environment variables
-        self.client = openai.OpenAI()
-        
-        # Article template structure
-        self.template = {
-            "title": "",
-            "subtitle": "",
-            "category": "",
-            "authors": [],
-            "paper_url": "",
-            "read_time": "",
-            "publish_date": "",
-            "concept_explained": "",
-            "content": {
-                "background": "",
-                "methodology": "",
-                "results": "",
-                "significance": ""
-            },
-            "concept_explanation": {
-                "title": "",
-                "content": ""
-            },
-            "summary": ""
-        }
+    def __init__(self, max_requests_per_minute: int = 500, max_tokens_per_minute: int = 200_000,
+                 cache_path: Optional[str] = None, semantic_threshold: Optional[float] = None):
+        # OpenAI API is already configured via environment variables.
+        # The async client is created lazily so it binds to the running event loop.
+        self._client = None
+        self.limiter = RateLimiter(max_requests_per_minute, max_tokens_per_minute)
+        self.semantic_threshold = semantic_threshold
+        self.cache = ResponseCache(cache_path, semantic_threshold) if cache_path else None
+        self._encoding = tiktoken.get_encoding("o200k_base")
+    
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """
+        Async OpenAI client, created on first use.
+        
+        Uses the aiohttp transport, which holds up far better than the default
+        httpx client under many concurrent requests. One client (and so one
+        connection pool) is shared by every call until aclose().
+        """
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(http_client=openai.DefaultAioHttpClient())
+        return self._client
+    
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    def _run_sync(self, coro):
+        """Run a coroutine to completion, closing the client bound to its event loop."""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(runner())
     
-    def generate_article(self, paper: Dict) -> Dict:
+    async def generate_article(self, paper: Dict) -> Dict:
         """
         Generate a complete article from a paper dictionary.
         
+        All sections are requested in a single JSON-mode call so the paper
+        context is only sent once; any section missing from the response is
+        regenerated with its individual prompt.
+        
         Args:
             paper: Paper information from arXiv fetcher
             
@@ -51,27 +320,49 @@ class ArticleGenerator:
         """
         print(f"Generating article for: {paper['title']}")
         
-        # Generate main content sections
-        background = self._generate_background(paper)
-        methodology = self._generate_methodology(paper)
-        results = self._generate_results(paper)
-        significance = self._generate_significance(paper)
-        
-        # Generate concept explanation
-        concept_title, concept_content = self._generate_concept_explanation(paper)
+        sections = await self._generate_all_sections(paper)
+        return await self._finish_article(paper, sections)
+    
+    async def _finish_article(self, paper: Dict, sections: Dict[str, str]) -> Dict:
+        """Fill in any missing sections and build the article."""
+        await self._fill_missing_sections(paper, sections)
         
-        # Generate summary
-        summary = self._generate_summary(paper)
+        # Keep tokenization off the event loop when many papers are in flight;
+        # tiktoken releases the GIL, so a thread is enough
+        total_tokens = await asyncio.to_thread(self._count_tokens, self._read_time_texts(sections))
         
-        # Estimate read time (average 200 words per minute)
-        total_words = len((background + methodology + results + significance + concept_content).split())
-        read_time = max(1, round(total_words / 200))
+        return self._assemble_article(paper, sections, total_tokens)
+    
+    def _count_tokens(self, texts: List[str]) -> int:
+        """Count tokens across texts, treating special tokens in model output as plain text."""
+        return sum(len(self._encoding.encode(text, disallowed_special=())) for text in texts)
+    
+    def _read_time_texts(self, sections: Dict[str, str]) -> List[str]:
+        """Sections counted towards the read time estimate."""
+        return [sections["background"], sections["methodology"], sections["results"],
+                sections["significance"], sections["concept_content"]]
+    
+    def _assemble_article(self, paper: Dict, sections: Dict[str, str],
+                          total_tokens: Optional[int] = None) -> Dict:
+        """Build the article dictionary from the generated sections."""
+        background = sections["background"]
+        methodology = sections["methodology"]
+        results = sections["results"]
+        significance = sections["significance"]
+        concept_title = sections["concept_title"]
+        concept_content = sections["concept_content"]
+        summary = sections["summary"]
+        subtitle = sections["subtitle"]
+        
+        # Estimate read time (average 200 words per minute, roughly 260 tokens)
+        if total_tokens is None:
+            total_tokens = self._count_tokens(self._read_time_texts(sections))
+        read_time = max(1, round(total_tokens / 260))
         
         # Create article structure
-        article = self.template.copy()
-        article.update({
+        return {
             "title": f"Paper Explained: {paper['title']} - A Beginner's Guide",
-            "subtitle": self._generate_subtitle(paper),
+            "subtitle": subtitle,
             "category": self._format_category(paper['category']),
             "authors": paper['authors'],
             "paper_url": f"https://arxiv.org/abs/{paper['id']}",
@@ -89,233 +380,564 @@ class ArticleGenerator:
                 "content": concept_content
             },
             "summary": summary
-        })
-        
-        return article
+        }
     
-    def _generate_background(self, paper: Dict) -> str:
-        """Generate the background section explaining why the research was needed."""
-        prompt = f"""
-        Write a beginner-friendly explanation of why the research in this paper was needed. 
+    def generate_article_sync(self, paper: Dict) -> Dict:
+        """Synchronous wrapper around generate_article for non-async callers."""
+        return self._run_sync(self.generate_article(paper))
+    
+    async def _generate_all_sections(self, paper: Dict) -> Dict[str, str]:
+        """Generate every article section in one call, returned as a JSON object."""
+        response = await self._call_openai(paper, PROMPT_ALL_SECTIONS,
+                                            response_format={"type": "json_object"},
+                                            generation_budget=ALL_SECTIONS_TOKEN_BUDGET)
+        return self._parse_sections(paper, response)
+    
+    def _parse_sections(self, paper: Dict, response: str) -> Dict[str, str]:
+        """Extract the non-empty sections from a combined JSON response."""
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            print(f"Could not parse combined sections for: {paper['title']}")
+            return {}
         
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
+        return self._extract_sections(data)
+    
+    def _extract_sections(self, data) -> Dict[str, str]:
+        """Keep the non-empty string sections of a decoded JSON object."""
+        if not isinstance(data, dict):
+            return {}
+        
+        return {
+            key: data[key].strip()
+            for key in SECTION_KEYS
+            if isinstance(data.get(key), str) and data[key].strip()
+        }
+    
+    async def generate_articles_batch(self, papers: List[Dict]) -> List[Dict]:
+        """
+        Generate articles for several papers with a single request.
         
-        Requirements:
-        - Explain in simple terms what problems existed before this research
-        - Use analogies and everyday examples where possible
-        - Avoid technical jargon
-        - Write 2-3 paragraphs
-        - Target audience: university students new to AI
+        Sharing one request amortizes its fixed latency across the papers.
+        Each article in the response is validated on its own; papers that are
+        missing from it, or whose sections are incomplete, fall back to the
+        individual section prompts.
         
-        Focus on the motivation and context, not the solution.
+        Args:
+            papers: Papers from the arXiv fetcher, a handful at a time
+            
+        Returns:
+            List of article dictionaries, in the same order as papers
         """
+        print(f"Generating {len(papers)} articles in one request")
         
-        return self._call_openai(prompt)
+        response = await self._complete(self._build_batch_messages(papers),
+                                        response_format={"type": "json_object"},
+                                        generation_budget=ALL_SECTIONS_TOKEN_BUDGET * len(papers))
+        try:
+            items = orjson.loads(response).get("articles", [])
+        except (orjson.JSONDecodeError, AttributeError):
+            print("Could not parse batched articles, generating them individually")
+            items = []
+        
+        by_id = {}
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict) and isinstance(item.get("id"), str):
+                by_id[item["id"]] = self._extract_sections(item)
+        
+        return list(await asyncio.gather(*(
+            self._finish_article(paper, by_id.get(paper['id'], {})) for paper in papers
+        )))
     
-    def _generate_methodology(self, paper: Dict) -> str:
-        """Generate the methodology section explaining how the research works."""
-        prompt = f"""
-        Explain the key innovation and methodology of this research paper in beginner-friendly terms.
-        
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
+    async def submit_articles_batch(self, papers: List[Dict], poll_interval: float = 60) -> List[Dict]:
+        """
+        Generate articles through the OpenAI Batch API.
         
-        Requirements:
-        - Break down the main approach into simple steps
-        - Use analogies and metaphors to explain complex concepts
-        - Avoid mathematical formulas and technical details
-        - Write 3-4 paragraphs
-        - Use numbered lists or bullet points where helpful
-        - Target audience: university students new to AI
+        Batch requests cost about half as much and use a separate rate-limit
+        pool, at the price of up to 24 hours turnaround, which suits offline
+        bulk generation. One request is submitted per paper using the combined
+        sections prompt.
         
-        Focus on WHAT they did and HOW it works conceptually, not the technical implementation.
+        Args:
+            papers: Papers from the arXiv fetcher
+            poll_interval: Seconds between batch status checks
+            
+        Returns:
+            Generated articles, in the same order as papers
         """
+        lines = []
+        for i, paper in enumerate(papers):
+            lines.append(json.dumps({
+                "custom_id": f"{i}:{paper['id']}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": MODEL,
+                    "messages": self._build_messages(paper, PROMPT_ALL_SECTIONS),
+                    "response_format": {"type": "json_object"},
+                    "prompt_cache_key": self._prompt_cache_key(paper),
+                },
+            }, ensure_ascii=False))
+        batch_input = ("\n".join(lines) + "\n").encode("utf-8")
+        
+        batch_file = await self.client.files.create(file=("articles_batch.jsonl", batch_input),
+                                                    purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"Submitted batch {batch.id} for {len(papers)} papers")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} finished with status {batch.status}")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        responses = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
         
-        return self._call_openai(prompt)
+        articles = []
+        for i, paper in enumerate(papers):
+            sections = self._parse_sections(paper, responses.get(f"{i}:{paper['id']}", ""))
+            await self._fill_missing_sections(paper, sections)
+            articles.append(self._assemble_article(paper, sections))
+        
+        return articles
     
-    def _generate_results(self, paper: Dict) -> str:
-        """Generate the results section explaining the impact and achievements."""
-        prompt = f"""
-        Explain the results and achievements of this research paper in beginner-friendly terms.
+    async def _fill_missing_sections(self, paper: Dict, sections: Dict[str, str]):
+        """Generate any sections missing from the combined response with the individual prompts."""
+        fallbacks = {
+            "background": self._generate_background,
+            "methodology": self._generate_methodology,
+            "results": self._generate_results,
+            "significance": self._generate_significance,
+            "summary": self._generate_summary,
+            "subtitle": self._generate_subtitle,
+        }
+        tasks = {key: generate(paper) for key, generate in fallbacks.items() if key not in sections}
+        if "concept_title" not in sections or "concept_content" not in sections:
+            tasks["concept"] = self._generate_concept_explanation(paper)
         
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
+        if not tasks:
+            return
         
-        Requirements:
-        - Explain what the research achieved
-        - Compare to previous methods if relevant
-        - Mention specific improvements or breakthroughs
-        - Write 2-3 paragraphs
-        - Use simple language and avoid technical metrics
-        - Target audience: university students new to AI
+        print(f"Falling back to individual prompts for: {', '.join(tasks)}")
         
-        Focus on the practical impact and what made this work significant.
-        """
+        async def keyed(key, task):
+            return key, await task
         
-        return self._call_openai(prompt)
+        for finished in asyncio.as_completed([keyed(key, task) for key, task in tasks.items()]):
+            key, value = await finished
+            if key == "concept":
+                sections["concept_title"], sections["concept_content"] = value
+            else:
+                sections[key] = value
+    
+    async def _generate_background(self, paper: Dict) -> str:
+        """Generate the background section explaining why the research was needed."""
+        return await self._call_openai(paper, PROMPT_BACKGROUND)
+    
+    async def _generate_methodology(self, paper: Dict) -> str:
+        """Generate the methodology section explaining how the research works."""
+        return await self._call_openai(paper, PROMPT_METHODOLOGY)
+    
+    async def _generate_results(self, paper: Dict) -> str:
+        """Generate the results section explaining the impact and achievements."""
+        return await self._call_openai(paper, PROMPT_RESULTS)
     
-    def _generate_significance(self, paper: Dict) -> str:
+    async def _generate_significance(self, paper: Dict) -> str:
         """Generate the significance section explaining long-term impact."""
-        prompt = f"""
-        Explain why this research paper matters today and its long-term significance in AI.
-        
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
-        Published: {paper['published']}
-        
-        Requirements:
-        - Explain how this research influenced later developments
-        - Mention specific applications or systems that use this work
-        - Connect to modern AI systems people know (ChatGPT, etc.)
-        - Write 2-3 paragraphs
-        - Use simple language
-        - Target audience: university students new to AI
-        
-        Focus on the lasting impact and why someone should care about this paper today.
-        """
-        
-        return self._call_openai(prompt)
+        return await self._call_openai(paper, PROMPT_SIGNIFICANCE)
     
-    def _generate_concept_explanation(self, paper: Dict) -> tuple[str, str]:
+    async def _generate_concept_explanation(self, paper: Dict) -> tuple[str, str]:
         """Generate a detailed explanation of one key concept from the paper."""
         # First, identify the key concept
-        concept_prompt = f"""
-        Identify the single most important technical concept introduced or used in this paper that a beginner should understand.
-        
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
-        
-        Return only the name of the concept (2-4 words maximum). Examples:
-        - "Self-Attention Mechanism"
-        - "Convolutional Neural Networks"
-        - "Adversarial Training"
-        - "Bidirectional Context"
-        """
-        
-        concept_title = self._call_openai(concept_prompt).strip()
+        concept_title = (await self._call_openai(paper, PROMPT_CONCEPT_TITLE)).strip()
         
         # Then explain the concept in detail
-        explanation_prompt = f"""
-        Provide a detailed, beginner-friendly explanation of "{concept_title}" as it relates to the paper "{paper['title']}".
-        
-        Paper Abstract: {paper['summary']}
-        
-        Requirements:
-        - Start with a simple analogy or real-world example
-        - Explain how it works step by step
-        - Use concrete examples
-        - Explain why this concept is important
-        - Write 4-5 paragraphs
-        - Use simple language and avoid jargon
-        - Target audience: university students new to AI
-        - Include practical applications where relevant
-        
-        Make this explanation comprehensive enough that a beginner could understand and explain the concept to someone else.
-        """
-        
-        concept_content = self._call_openai(explanation_prompt)
+        explanation_prompt = PROMPT_CONCEPT_EXPLANATION.format(concept_title=concept_title)
+        concept_content = await self._call_openai(paper, explanation_prompt)
         
         return concept_title, concept_content
     
-    def _generate_summary(self, paper: Dict) -> str:
+    async def _generate_summary(self, paper: Dict) -> str:
         """Generate a one-sentence summary of the paper."""
-        prompt = f"""
-        Write a single, clear sentence that summarizes the main contribution of this research paper.
-        
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
-        
-        Requirements:
-        - One sentence only
-        - Simple language
-        - Capture the essence of what this paper achieved
-        - Target audience: university students new to AI
-        
-        Example format: "This paper introduced [innovation] which [impact], becoming the foundation for [applications]."
-        """
-        
-        return self._call_openai(prompt).strip()
+        return (await self._call_openai(paper, PROMPT_SUMMARY)).strip()
     
-    def _generate_subtitle(self, paper: Dict) -> str:
+    async def _generate_subtitle(self, paper: Dict) -> str:
         """Generate an engaging subtitle for the article."""
-        prompt = f"""
-        Create an engaging subtitle for a beginner-friendly explanation of this research paper.
-        
-        Paper Title: {paper['title']}
-        Abstract: {paper['summary']}
-        
-        Requirements:
-        - 5-10 words
-        - Capture the main innovation or impact
-        - Make it appealing to beginners
-        - Avoid technical jargon
-        
-        Examples:
-        - "How the Transformer Architecture Revolutionized AI"
-        - "The Deep Learning Breakthrough That Started It All"
-        - "Two Neural Networks Competing to Create Reality"
-        """
-        
-        return self._call_openai(prompt).strip()
+        return (await self._call_openai(paper, PROMPT_SUBTITLE)).strip()
     
     def _format_category(self, category_slug: str) -> str:
         """Convert category slug to display name."""
-        category_map = {
-            'foundation-models': 'Foundation Models',
-            'generative-models': 'Generative Models',
-            'optimization': 'Optimization',
-            'applications': 'Applications',
-            'basic-concepts': 'Basic Concepts'
-        }
-        return category_map.get(category_slug, 'Basic Concepts')
+        return CATEGORY_NAMES.get(category_slug, 'Basic Concepts')
+    
+    def _build_messages(self, paper: Dict, task_prompt: str) -> List[Dict]:
+        """
+        Build the chat messages for one task about a paper.
+        
+        The paper context lives in the system message, which is byte-identical
+        for every call about the same paper, so OpenAI's automatic prompt
+        caching can reuse the shared prefix; only the task differs.
+        """
+        system = (f"{SYSTEM_PROMPT}\n\n"
+                  f"PAPER CONTEXT:\n"
+                  f"Title: {paper['title']}\n"
+                  f"Abstract: {paper['summary']}\n"
+                  f"Published: {paper['published']}")
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": task_prompt}
+        ]
+    
+    def _build_batch_messages(self, papers: List[Dict]) -> List[Dict]:
+        """Build the chat messages for generating articles for several papers at once."""
+        context = "\n\n".join(
+            f"ID: {paper['id']}\n"
+            f"Title: {paper['title']}\n"
+            f"Abstract: {paper['summary']}\n"
+            f"Published: {paper['published']}"
+            for paper in papers
+        )
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"{PROMPT_ARTICLES_BATCH}\n\nPAPERS:\n{context}"}
+        ]
+    
+    async def _call_openai(self, paper: Dict, task_prompt: str, response_format: Optional[Dict] = None,
+                           generation_budget: int = GENERATION_TOKEN_BUDGET) -> str:
+        """Make a rate-limited, cached call to OpenAI API about a paper."""
+        return await self._complete(self._build_messages(paper, task_prompt), response_format, generation_budget,
+                                    prompt_cache_key=self._prompt_cache_key(paper))
+    
+    @staticmethod
+    def _prompt_cache_key(paper: Dict) -> str:
+        """
+        Routing hint for OpenAI's prompt cache.
+        
+        Every request about a paper shares its system message, so sending them
+        with the same key keeps them on servers that already hold that prefix.
+        """
+        return f"paper-{paper['id']}"
     
-    def _call_openai(self, prompt: str) -> str:
-        """Make a call to OpenAI API with error handling."""
+    async def _complete(self, messages: List[Dict], response_format: Optional[Dict] = None,
+                        generation_budget: int = GENERATION_TOKEN_BUDGET,
+                        prompt_cache_key: Optional[str] = None) -> str:
+        """Make a rate-limited, cached call to OpenAI API with error handling."""
+        extra_args = {"response_format": response_format} if response_format else {}
+        if prompt_cache_key:
+            extra_args["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-5-nano",
-                messages=[
-                    {"role": "system", "content": "You are an expert at explaining complex AI research papers in simple, beginner-friendly terms. You use analogies, examples, and clear language to make technical concepts accessible to university students new to AI."},
-                    {"role": "user", "content": prompt}
-                ],
-            )
+            cache_key = embedding = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(messages, response_format)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                
+                if self.cache.semantic_threshold is not None:
+                    embedding = await self._embed(messages)
+                    cached = self.cache.nearest(embedding)
+                    if cached is not None:
+                        return cached
+            
+            # Papers about tokenizers quote special tokens like <|endoftext|>; count them as text
+            estimated_tokens = (sum(len(self._encoding.encode(m["content"], disallowed_special=()))
+                                    for m in messages) + generation_budget)
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                await self.limiter.acquire(req=1, tokens=estimated_tokens)
+                try:
+                    stream = await self.client.chat.completions.create(
+                        model=MODEL,
+                        messages=messages,
+                        stream=True,
+                        **extra_args,
+                    )
+                    parts = []
+                    async for chunk in stream:
+                        if chunk.choices:
+                            parts.append(chunk.choices[0].delta.content or "")
+                    break
+                except openai.RateLimitError as e:
+                    if attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    retry_after = e.response.headers.get("retry-after")
+                    try:
+                        delay = float(retry_after)
+                    except (TypeError, ValueError):
+                        delay = 2 ** attempt
+                    print(f"Rate limited by OpenAI API, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
             
-            return response.choices[0].message.content.strip()
+            content = "".join(parts).strip()
+            if self.cache is not None:
+                self.cache.set(cache_key, content, embedding)
+            return content
             
         except Exception as e:
             print(f"Error calling OpenAI API: {e}")
-            return f"Error generating content: {e}"
+            return f"{ERROR_CONTENT_PREFIX}{e}"
+    
+    async def _embed(self, messages: List[Dict]) -> List[float]:
+        """Embed the text of a request for semantic cache lookups."""
+        return await self.embed_text("\n\n".join(m["content"] for m in messages))
+    
+    async def embed_text(self, text: str) -> List[float]:
+        """Embed text with the embedding model, respecting the rate limiter."""
+        await self.limiter.acquire(req=1, tokens=len(self._encoding.encode(text, disallowed_special=())))
+        response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        return response.data[0].embedding
     
     def save_article(self, article: Dict, filename: str):
         """Save article to JSON file."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(article, f, indent=2, ensure_ascii=False)
+        _serialize_and_write(article, filename)
+        print(f"Saved article to {filename}")
+    
+    async def save_article_async(self, article: Dict, filename: str):
+        """Save article to JSON file without blocking the event loop."""
+        data = orjson.dumps(article, option=JSON_OPTIONS)
+        async with aiofiles.open(filename, 'wb') as f:
+            await f.write(data)
         print(f"Saved article to {filename}")
     
-    def generate_multiple_articles(self, papers: List[Dict], output_dir: str = "articles"):
+    def generate_multiple_articles(self, papers: List[Dict], output_dir: str = "articles",
+                                   max_concurrency: int = 8, use_batch: bool = False):
         """Generate articles for multiple papers."""
+        return self._run_sync(self.generate_multiple_articles_async(papers, output_dir, max_concurrency,
+                                                                    use_batch))
+    
+    async def generate_multiple_articles_async(self, papers: List[Dict], output_dir: str = "articles",
+                                               max_concurrency: int = 8,
+                                               use_batch: bool = False) -> List[Dict]:
+        """
+        Generate articles for multiple papers concurrently.
+        
+        Args:
+            papers: Papers from the arXiv fetcher
+            output_dir: Directory the article JSON files are written to
+            max_concurrency: Maximum number of papers in flight at once
+            use_batch: Submit the papers through the Batch API instead
+            
+        Returns:
+            Successfully generated articles, in the same order as papers
+        """
         os.makedirs(output_dir, exist_ok=True)
         
-        articles = []
-        for i, paper in enumerate(papers):
-            try:
-                article = self.generate_article(paper)
-                
-                # Create filename from paper ID
+        if self.cache is None:
+            self.cache = ResponseCache(os.path.join(output_dir, ".cache.sqlite"), self.semantic_threshold)
+        
+        if use_batch:
+            articles = await self.submit_articles_batch(papers)
+            for paper, article in zip(papers, articles):
                 filename = f"{output_dir}/article_{paper['id'].replace('/', '_')}.json"
-                self.save_article(article, filename)
-                
-                articles.append(article)
-                
-                print(f"Generated article {i+1}/{len(papers)}")
-                
-            except Exception as e:
-                print(f"Error generating article for {paper['title']}: {e}")
+                await self.save_article_async(article, filename)
+            return articles
+        
+        sem = asyncio.Semaphore(max_concurrency)
+        done = 0
+        
+        async def _one(paper: Dict) -> Dict:
+            nonlocal done
+            async with sem:
+                article = await self.generate_article(paper)
+            
+            # Create filename from paper ID
+            filename = f"{output_dir}/article_{paper['id'].replace('/', '_')}.json"
+            await asyncio.to_thread(_serialize_and_write, article, filename)
+            print(f"Saved article to {filename}")
+            
+            done += 1
+            print(f"Generated article {done}/{len(papers)}")
+            return article
+        
+        results = await asyncio.gather(*[_one(p) for p in papers], return_exceptions=True)
+        
+        articles = []
+        for paper, result in zip(papers, results):
+            if isinstance(result, BaseException):
+                print(f"Error generating article for {paper['title']}: {result}")
                 continue
+            articles.append(result)
         
         return articles
 
+
+class CachedArticleGenerator:
+    """
+    Persistent cache of generated articles in front of an ArticleGenerator.
+    
+    Articles are keyed by a SHA-256 of the paper ID and title, so regenerating
+    a paper that was already written (e.g. a sample of a classic paper) skips
+    the API entirely. When threshold is set, a miss falls back to a cached
+    article for another version of the same paper (same arXiv ID without the
+    vN suffix) whose title+abstract embedding reaches the threshold cosine
+    similarity; articles are never reused across different papers. Embeddings
+    are only requested once another version of the paper is cached. Entries
+    expire after ttl seconds.
+    
+    Any other attribute is delegated to the wrapped generator.
+    """
+    
+    def __init__(self, generator: ArticleGenerator, cache_dir: str = "generated_content/cache",
+                 threshold: Optional[float] = 0.92, ttl: int = 7 * 86400):
+        self.generator = generator
+        self.threshold = threshold
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "articles.sqlite"))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "key TEXT PRIMARY KEY, article TEXT NOT NULL, embedding BLOB, created REAL NOT NULL, "
+            "base_id TEXT, source TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        for column in ("base_id", "source"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column} TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_base_id ON articles (base_id)")
+        self._conn.commit()
+    
+    def __getattr__(self, name):
+        return getattr(self.generator, name)
+    
+    @staticmethod
+    def make_key(paper: Dict) -> str:
+        payload = json.dumps({"id": paper["id"], "title": paper["title"]}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def base_id(paper: Dict) -> str:
+        """arXiv ID without its version suffix, shared by every version of a paper."""
+        return re.sub(r"v\d+$", "", paper["id"])
+    
+    @staticmethod
+    def embed_source(paper: Dict) -> str:
+        """Text embedded to compare versions of a paper."""
+        abstract = paper.get('summary') or paper.get('abstract', '')
+        return f"{paper['title']}\n\n{abstract}"
+    
+    def get(self, key: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT article FROM articles WHERE key = ? AND created >= ?",
+                                 (key, time.time() - self.ttl)).fetchone()
+        return orjson.loads(row[0]) if row else None
+    
+    def has_base_id(self, base_id: str) -> bool:
+        """Whether any unexpired article is cached for the base arXiv ID."""
+        return self._conn.execute("SELECT 1 FROM articles WHERE base_id = ? AND created >= ? LIMIT 1",
+                                  (base_id, time.time() - self.ttl)).fetchone() is not None
+    
+    async def _embed_missing(self, base_id: str):
+        """Embed cached articles for the base arXiv ID that were stored without an embedding."""
+        rows = self._conn.execute(
+            "SELECT key, source FROM articles WHERE base_id = ? AND embedding IS NULL "
+            "AND source IS NOT NULL AND created >= ?",
+            (base_id, time.time() - self.ttl)
+        ).fetchall()
+        for key, source in rows:
+            embedding = await self.generator.embed_text(source)
+            self._conn.execute("UPDATE articles SET embedding = ? WHERE key = ?",
+                               (_normalize(embedding).tobytes(), key))
+        if rows:
+            self._conn.commit()
+    
+    def nearest(self, embedding: List[float], base_id: str) -> Optional[Dict]:
+        """Return the most similar cached article for the same base arXiv ID, if above the threshold."""
+        rows = self._conn.execute(
+            "SELECT article, embedding FROM articles WHERE base_id = ? AND embedding IS NOT NULL AND created >= ?",
+            (base_id, time.time() - self.ttl)
+        ).fetchall()
+        
+        query = _normalize(embedding)
+        best_score, best_article = -1.0, None
+        for article, blob in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            score = sum(a * b for a, b in zip(query, vector))
+            if score > best_score:
+                best_score, best_article = score, article
+        
+        if best_article is not None and best_score >= self.threshold:
+            return orjson.loads(best_article)
+        return None
+    
+    def set(self, key: str, article: Dict, embedding: Optional[List[float]] = None,
+            base_id: Optional[str] = None, source: Optional[str] = None):
+        blob = _normalize(embedding).tobytes() if embedding is not None else None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO articles (key, article, embedding, created, base_id, source) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, orjson.dumps(article).decode("utf-8"), blob, time.time(), base_id, source)
+        )
+        self._conn.commit()
+    
+    async def _lookup(self, paper: Dict):
+        """Return (key, embedding, article) for a paper; article is None on a miss."""
+        key = self.make_key(paper)
+        article = self.get(key)
+        if article is not None:
+            print(f"Using cached article for {paper['title']}")
+            return key, None, article
+        
+        embedding = None
+        base_id = self.base_id(paper)
+        # Embeddings cost an API call, so only compare when another version is cached
+        if self.threshold is not None and self.has_base_id(base_id):
+            try:
+                embedding = await self.generator.embed_text(self.embed_source(paper))
+                await self._embed_missing(base_id)
+            except Exception as e:
+                # The semantic tier is only an optimisation; treat a failed embedding as a miss
+                print(f"Error embedding {paper['title']}: {e}")
+                return key, None, None
+            article = self.nearest(embedding, base_id)
+            if article is not None:
+                print(f"Using cached article from another version of {paper['title']}")
+                article = {**article, "paper_url": f"https://arxiv.org/abs/{paper['id']}"}
+                self.set(key, article, embedding, base_id, self.embed_source(paper))
+        return key, embedding, article
+    
+    async def generate_article(self, paper: Dict) -> Dict:
+        """Return a cached article for the paper, generating and caching it on a miss."""
+        key, embedding, article = await self._lookup(paper)
+        if article is None:
+            article = await self.generator.generate_article(paper)
+            if not is_error_article(article):
+                self.set(key, article, embedding, self.base_id(paper), self.embed_source(paper))
+        return article
+    
+    async def generate_articles_batch(self, papers: List[Dict]) -> List[Dict]:
+        """Return cached articles where available, generating the rest in one batched request."""
+        lookups = await asyncio.gather(*(self._lookup(paper) for paper in papers))
+        misses = [i for i, (_, _, article) in enumerate(lookups) if article is None]
+        
+        articles = [article for _, _, article in lookups]
+        if misses:
+            generated = await self.generator.generate_articles_batch([papers[i] for i in misses])
+            for i, article in zip(misses, generated):
+                key, embedding, _ = lookups[i]
+                if not is_error_article(article):
+                    self.set(key, article, embedding, self.base_id(papers[i]), self.embed_source(papers[i]))
+                articles[i] = article
+        return articles
+    
+    def generate_article_sync(self, paper: Dict) -> Dict:
+        """Synchronous wrapper around generate_article for non-async callers."""
+        return self.generator._run_sync(self.generate_article(paper))
+    
+    def close(self):
+        self._conn.close()
+
 def main():
     """Example usage of ArticleGenerator."""
     generator = ArticleGenerator()
@@ -327,7 +949,7 @@ def main():
         
         # Generate article for the first paper (Attention Is All You Need)
         if papers:
-            article = generator.generate_article(papers[0])
+            article = generator.generate_article_sync(papers[0])
             generator.save_article(article, 'sample_article.json')
             print("Sample article generated successfully!")
         
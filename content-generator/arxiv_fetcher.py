@@ -4,67 +4,117 @@ ArXiv Paper Fetcher
 Fetches paper information from arXiv API for AI/ML paper blog generation.
 """
 
+import asyncio
+import aiofiles
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from datetime import datetime
-import json
-import time
+from operator import itemgetter
+from types import MappingProxyType
 from typing import List, Dict, Optional
 
+# Atom element names in Clark notation
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_SUMMARY = f"{ATOM_NS}summary"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+ATOM_ID = f"{ATOM_NS}id"
+ATOM_AUTHOR = f"{ATOM_NS}author"
+ATOM_NAME = f"{ATOM_NS}name"
+ATOM_CATEGORY = f"{ATOM_NS}category"
+
+# Landmark papers used for the initial blog content. Read-only and shared;
+# get_classic_papers hands out copies.
+CLASSIC_PAPERS = (
+    MappingProxyType({
+        "id": "1706.03762",
+        "title": "Attention Is All You Need",
+        "authors": ("Ashish Vaswani", "Noam Shazeer", "Niki Parmar", "Jakob Uszkoreit", "Llion Jones", "Aidan N. Gomez", "Lukasz Kaiser", "Illia Polosukhin"),
+        "abstract": "The dominant sequence transduction models are based on complex recurrent or convolutional neural networks that include an encoder and a decoder. The best performing models also connect the encoder and decoder through an attention mechanism. We propose a new simple network architecture, the Transformer, based solely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
+        "published": "2017-06-12",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1706.03762"
+    }),
+    MappingProxyType({
+        "id": "1207.0580",
+        "title": "ImageNet Classification with Deep Convolutional Neural Networks",
+        "authors": ("Alex Krizhevsky", "Ilya Sutskever", "Geoffrey E. Hinton"),
+        "abstract": "We trained a large, deep convolutional neural network to classify the 1.2 million high-resolution images in the ImageNet LSVRC-2010 contest into the 1000 different classes. On the test data, we achieved top-1 and top-5 error rates of 37.5% and 17.0% which is considerably better than the previous state-of-the-art.",
+        "published": "2012-07-03",
+        "category": "basic-concepts",
+        "url": "https://arxiv.org/abs/1207.0580"
+    }),
+    MappingProxyType({
+        "id": "1406.2661",
+        "title": "Generative Adversarial Networks",
+        "authors": ("Ian J. Goodfellow", "Jean Pouget-Abadie", "Mehdi Mirza", "Bing Xu", "David Warde-Farley", "Sherjil Ozair", "Aaron Courville", "Yoshua Bengio"),
+        "abstract": "We propose a new framework for estimating generative models via an adversarial process, in which we simultaneously train two models: a generative model G that captures the data distribution, and a discriminative model D that estimates the probability that a sample came from the training data rather than G.",
+        "published": "2014-06-10",
+        "category": "generative-models",
+        "url": "https://arxiv.org/abs/1406.2661"
+    }),
+    MappingProxyType({
+        "id": "1810.04805",
+        "title": "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
+        "authors": ("Jacob Devlin", "Ming-Wei Chang", "Kenton Lee", "Kristina Toutanova"),
+        "abstract": "We introduce a new language representation model called BERT, which stands for Bidirectional Encoder Representations from Transformers. Unlike recent language representation models, BERT is designed to pre-train deep bidirectional representations from unlabeled text by jointly conditioning on both left and right context in all layers.",
+        "published": "2018-10-11",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1810.04805"
+    }),
+    MappingProxyType({
+        "id": "1909.11942",
+        "title": "Language Models are Unsupervised Multitask Learners",
+        "authors": ("Alec Radford", "Jeffrey Wu", "Rewon Child", "David Luan", "Dario Amodei", "Ilya Sutskever"),
+        "abstract": "Natural language processing tasks, such as question answering, machine translation, reading comprehension, and summarization, are typically approached with supervised learning on taskspecific datasets. We demonstrate that language models begin to learn these tasks without any explicit supervision when trained on a new dataset of millions of webpages called WebText.",
+        "published": "2019-02-14",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1909.11942"
+    })
+)
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (3.05, 30)
+ASYNC_REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=3.05, sock_read=30)
+
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# arXiv category -> blog category; anything unmapped becomes 'basic-concepts'
+CATEGORY_MAPPING = MappingProxyType({
+    'cs.LG': 'foundation-models',  # Machine Learning
+    'cs.CL': 'foundation-models',  # Computation and Language
+    'cs.CV': 'basic-concepts',     # Computer Vision
+    'cs.AI': 'foundation-models',  # Artificial Intelligence
+    'cs.NE': 'basic-concepts',     # Neural and Evolutionary Computing
+    'stat.ML': 'foundation-models', # Machine Learning (Statistics)
+    'cs.RO': 'applications',       # Robotics
+    'cs.HC': 'applications',       # Human-Computer Interaction
+    'q-bio': 'applications',       # Quantitative Biology
+})
+
 class ArxivFetcher:
     def __init__(self):
         self.base_url = "http://export.arxiv.org/api/query"
-        self.classic_papers = [
-            {
-                "id": "1706.03762",
-                "title": "Attention Is All You Need",
-                "authors": ["Ashish Vaswani", "Noam Shazeer", "Niki Parmar", "Jakob Uszkoreit", "Llion Jones", "Aidan N. Gomez", "Lukasz Kaiser", "Illia Polosukhin"],
-                "abstract": "The dominant sequence transduction models are based on complex recurrent or convolutional neural networks that include an encoder and a decoder. The best performing models also connect the encoder and decoder through an attention mechanism. We propose a new simple network architecture, the Transformer, based solely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
-                "published": "2017-06-12",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1706.03762"
-            },
-            {
-                "id": "1207.0580",
-                "title": "ImageNet Classification with Deep Convolutional Neural Networks",
-                "authors": ["Alex Krizhevsky", "Ilya Sutskever", "Geoffrey E. Hinton"],
-                "abstract": "We trained a large, deep convolutional neural network to classify the 1.2 million high-resolution images in the ImageNet LSVRC-2010 contest into the 1000 different classes. On the test data, we achieved top-1 and top-5 error rates of 37.5% and 17.0% which is considerably better than the previous state-of-the-art.",
-                "published": "2012-07-03",
-                "category": "basic-concepts",
-                "url": "https://arxiv.org/abs/1207.0580"
-            },
-            {
-                "id": "1406.2661",
-                "title": "Generative Adversarial Networks",
-                "authors": ["Ian J. Goodfellow", "Jean Pouget-Abadie", "Mehdi Mirza", "Bing Xu", "David Warde-Farley", "Sherjil Ozair", "Aaron Courville", "Yoshua Bengio"],
-                "abstract": "We propose a new framework for estimating generative models via an adversarial process, in which we simultaneously train two models: a generative model G that captures the data distribution, and a discriminative model D that estimates the probability that a sample came from the training data rather than G.",
-                "published": "2014-06-10",
-                "category": "generative-models",
-                "url": "https://arxiv.org/abs/1406.2661"
-            },
-            {
-                "id": "1810.04805",
-                "title": "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
-                "authors": ["Jacob Devlin", "Ming-Wei Chang", "Kenton Lee", "Kristina Toutanova"],
-                "abstract": "We introduce a new language representation model called BERT, which stands for Bidirectional Encoder Representations from Transformers. Unlike recent language representation models, BERT is designed to pre-train deep bidirectional representations from unlabeled text by jointly conditioning on both left and right context in all layers.",
-                "published": "2018-10-11",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1810.04805"
-            },
-            {
-                "id": "1909.11942",
-                "title": "Language Models are Unsupervised Multitask Learners",
-                "authors": ["Alec Radford", "Jeffrey Wu", "Rewon Child", "David Luan", "Dario Amodei", "Ilya Sutskever"],
-                "abstract": "Natural language processing tasks, such as question answering, machine translation, reading comprehension, and summarization, are typically approached with supervised learning on taskspecific datasets. We demonstrate that language models begin to learn these tasks without any explicit supervision when trained on a new dataset of millions of webpages called WebText.",
-                "published": "2019-02-14",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1909.11942"
-            }
-        ]
+        
+        # Reuse connections to export.arxiv.org across queries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def get_classic_papers(self) -> List[Dict]:
         """Get the list of classic papers for initial blog content."""
-        return self.classic_papers
+        return [{**paper, "authors": list(paper["authors"])} for paper in CLASSIC_PAPERS]
     
     def search_papers(self, query: str, max_results: int = 10, category: str = None) -> List[Dict]:
         """
@@ -78,6 +128,45 @@ class ArxivFetcher:
         Returns:
             List of paper dictionaries
         """
+        params = self._build_params(query, max_results, category)
+        
+        try:
+            # Parse while the body is still arriving instead of buffering it first
+            with self.session.get(self.base_url, params=params, stream=True,
+                                  timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return self._parse_feed(response.raw)
+            
+        except Exception as e:
+            print(f"Error fetching papers: {e}")
+            return []
+    
+    async def _search_papers_async(self, session: aiohttp.ClientSession, limiter: AsyncLimiter,
+                                   query: str, max_results: int = 10, category: str = None) -> List[Dict]:
+        """Async variant of search_papers using a shared aiohttp session and rate limiter."""
+        params = self._build_params(query, max_results, category)
+        
+        try:
+            parser = etree.XMLPullParser(tag=ATOM_ENTRY)
+            papers = []
+            async with limiter:
+                async with session.get(self.base_url, params=params) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        parser.feed(chunk)
+                        papers.extend(self._collect_entries(parser.read_events()))
+            
+            parser.close()
+            papers.extend(self._collect_entries(parser.read_events()))
+            return papers
+            
+        except Exception as e:
+            print(f"Error fetching papers: {e}")
+            return []
+    
+    def _build_params(self, query: str, max_results: int, category: str = None) -> Dict:
+        """Build the arXiv API query parameters."""
         params = {
             'search_query': query,
             'start': 0,
@@ -89,52 +178,47 @@ class ArxivFetcher:
         if category:
             params['search_query'] = f"cat:{category} AND {query}"
         
-        try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            papers = []
-            
-            # Define namespaces
-            ns = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
-            
-            for entry in root.findall('atom:entry', ns):
-                paper = self._parse_entry(entry, ns)
-                if paper:
-                    papers.append(paper)
-            
-            return papers
+        return params
+    
+    def _parse_feed(self, source) -> List[Dict]:
+        """Stream-parse an Atom feed from a file-like object."""
+        return self._collect_entries(etree.iterparse(source, tag=ATOM_ENTRY))
+    
+    def _collect_entries(self, events) -> List[Dict]:
+        """Parse (event, entry) pairs, freeing each entry once it is parsed."""
+        papers = []
+        for _, entry in events:
+            paper = self._parse_entry(entry)
+            if paper:
+                papers.append(paper)
             
-        except Exception as e:
-            print(f"Error fetching papers: {e}")
-            return []
+            entry.clear()
+            while entry.getprevious() is not None:
+                del entry.getparent()[0]
+        
+        return papers
     
-    def _parse_entry(self, entry, ns) -> Optional[Dict]:
+    def _parse_entry(self, entry) -> Optional[Dict]:
         """Parse a single arXiv entry."""
         try:
             # Extract basic information
-            title = entry.find('atom:title', ns).text.strip().replace('\n', ' ')
-            abstract = entry.find('atom:summary', ns).text.strip().replace('\n', ' ')
-            published = entry.find('atom:published', ns).text[:10]  # YYYY-MM-DD
+            title = entry.find(ATOM_TITLE).text.strip().replace('\n', ' ')
+            abstract = entry.find(ATOM_SUMMARY).text.strip().replace('\n', ' ')
+            published = entry.find(ATOM_PUBLISHED).text[:10]  # YYYY-MM-DD
             
             # Extract arXiv ID from URL
-            arxiv_url = entry.find('atom:id', ns).text
+            arxiv_url = entry.find(ATOM_ID).text
             arxiv_id = arxiv_url.split('/')[-1]
             
             # Extract authors
             authors = []
-            for author in entry.findall('atom:author', ns):
-                name = author.find('atom:name', ns).text
+            for author in entry.iterfind(ATOM_AUTHOR):
+                name = author.find(ATOM_NAME).text
                 authors.append(name)
             
             # Extract categories
             categories = []
-            for category in entry.findall('atom:category', ns):
+            for category in entry.iterfind(ATOM_CATEGORY):
                 categories.append(category.get('term'))
             
             # Map arXiv categories to blog categories
@@ -157,24 +241,8 @@ class ArxivFetcher:
     
     def _map_category(self, arxiv_categories: List[str]) -> str:
         """Map arXiv categories to blog categories."""
-        category_mapping = {
-            'cs.LG': 'foundation-models',  # Machine Learning
-            'cs.CL': 'foundation-models',  # Computation and Language
-            'cs.CV': 'basic-concepts',     # Computer Vision
-            'cs.AI': 'foundation-models',  # Artificial Intelligence
-            'cs.NE': 'basic-concepts',     # Neural and Evolutionary Computing
-            'stat.ML': 'foundation-models', # Machine Learning (Statistics)
-            'cs.RO': 'applications',       # Robotics
-            'cs.HC': 'applications',       # Human-Computer Interaction
-            'q-bio': 'applications',       # Quantitative Biology
-        }
-        
-        for cat in arxiv_categories:
-            if cat in category_mapping:
-                return category_mapping[cat]
-        
-        # Default category
-        return 'basic-concepts'
+        return next((CATEGORY_MAPPING[cat] for cat in arxiv_categories if cat in CATEGORY_MAPPING),
+                    'basic-concepts')
     
     def get_recent_papers(self, days: int = 7, categories: List[str] = None) -> List[Dict]:
         """
@@ -187,26 +255,44 @@ class ArxivFetcher:
         Returns:
             List of recent papers
         """
+        return asyncio.run(self.get_recent_papers_async(days, categories))
+    
+    async def get_recent_papers_async(self, days: int = 7, categories: List[str] = None) -> List[Dict]:
+        """
+        Get recent papers from specified categories, querying them concurrently.
+        
+        A shared limiter keeps the overall rate at one request per second to be
+        respectful to the arXiv API.
+        """
         if categories is None:
             categories = ['cs.LG', 'cs.CL', 'cs.CV', 'cs.AI']
         
-        all_papers = []
+        limiter = AsyncLimiter(1, 1)
+        connector = aiohttp.TCPConnector(limit_per_host=2)
+        async with aiohttp.ClientSession(connector=connector, timeout=ASYNC_REQUEST_TIMEOUT) as session:
+            results = await asyncio.gather(*[
+                self._search_papers_async(session, limiter, f"cat:{category}", max_results=20)
+                for category in categories
+            ])
         
-        for category in categories:
-            query = f"cat:{category}"
-            papers = self.search_papers(query, max_results=20)
-            all_papers.extend(papers)
-            time.sleep(1)  # Be respectful to arXiv API
+        all_papers = [paper for papers in results for paper in papers]
         
         # Sort by publication date (most recent first)
-        all_papers.sort(key=lambda x: x['published'], reverse=True)
+        all_papers.sort(key=itemgetter('published'), reverse=True)
         
         return all_papers[:10]  # Return top 10 most recent
     
     def save_papers_to_json(self, papers: List[Dict], filename: str):
         """Save papers to JSON file."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(papers, option=JSON_OPTIONS))
+        print(f"Saved {len(papers)} papers to {filename}")
+    
+    async def save_papers_to_json_async(self, papers: List[Dict], filename: str):
+        """Save papers to JSON file without blocking the event loop."""
+        data = orjson.dumps(papers, option=JSON_OPTIONS)
+        async with aiofiles.open(filename, 'wb') as f:
+            await f.write(data)
         print(f"Saved {len(papers)} papers to {filename}")
 
 def main():
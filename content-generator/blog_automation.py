@@ -4,168 +4,338 @@ Blog Automation Script
 Main script for automated AI paper blog content generation and management.
 """
 
+import asyncio
+import fcntl
+import functools
+import heapq
+import logging
 import os
 import sys
-import json
+import time
 import argparse
-from datetime import datetime
-from typing import List, Dict
+import orjson
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, List, Dict, Optional, Tuple
 
 # Import our custom modules
 from arxiv_fetcher import ArxivFetcher
-from article_generator import ArticleGenerator
-from content_manager import ContentManager
+from article_generator import ArticleGenerator, CachedArticleGenerator, is_error_article
+from content_manager import ContentManager, GENERATED_ARTICLES_FILE, load_json
+
+log = logging.getLogger("blog_automation")
+
+# Article files read at once, to stay well below the open file limit
+MAX_CONCURRENT_READS = 64
+
+
+def _load_json(path: str) -> Optional[Dict]:
+    """Load a JSON file, returning None (after reporting the error) if it cannot be read."""
+    try:
+        return load_json(path)
+    except Exception as e:
+        log.error("Error loading %s: %s", path, e)
+        return None
+
+
+async def _read_json_files(paths: List[str]) -> List[Optional[Dict]]:
+    """Load JSON files in worker threads, returning results in the order of paths."""
+    sem = asyncio.Semaphore(MAX_CONCURRENT_READS)
+    
+    async def read(path: str) -> Optional[Dict]:
+        async with sem:
+            return await asyncio.to_thread(_load_json, path)
+    
+    return await asyncio.gather(*(read(path) for path in paths))
+
 
 class BlogAutomation:
-    def __init__(self, blog_path: str = "/home/ubuntu/ai-paper-blog"):
+    def __init__(self, blog_path: str = "/home/ubuntu/ai-paper-blog", concurrency: int = 8,
+                 use_cache: bool = True, cache_threshold: Optional[float] = 0.92, batch_size: int = 1):
         self.blog_path = blog_path
+        self.concurrency = concurrency
+        self.batch_size = max(1, batch_size)
         self.fetcher = ArxivFetcher()
-        self.generator = ArticleGenerator()
         self.manager = ContentManager(blog_path)
         
         # Create output directories
         self.output_dir = "generated_content"
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(f"{self.output_dir}/papers", exist_ok=True)
-        os.makedirs(f"{self.output_dir}/articles", exist_ok=True)
+        self.out = Path(self.output_dir)
+        self.papers_dir = self.out / "papers"
+        self.articles_dir = self.out / "articles"
+        for directory in (self.papers_dir, self.articles_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.out / "articles_manifest.jsonl"
+        self.daily_articles_path = Path(GENERATED_ARTICLES_FILE)
+        self._classic_papers_by_id = None
+        
+        # Papers already generated during this run
+        self._seen_ids = set()
+        
+        self.generator = ArticleGenerator()
+        if use_cache:
+            self.generator = CachedArticleGenerator(self.generator, str(self.out / "cache"),
+                                                    threshold=cache_threshold)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _safe_id(paper_id: str) -> str:
+        """Make a paper ID usable in a file name (old-style IDs contain a slash)."""
+        return paper_id.replace('/', '_')
+    
+    def _generate_articles(self, papers: List[Dict], article_name: Callable[[int, Dict], str]) -> List[Dict]:
+        """
+        Generate and save articles for papers concurrently.
+        
+        Args:
+            papers: Papers to generate articles for
+            article_name: Maps (index, paper) to the article file name without extension
+            
+        Returns:
+            Successfully generated articles, in the same order as papers
+        """
+        # Skip papers another generator has already covered in this run
+        indexed = []
+        for i, paper in enumerate(papers):
+            if paper['id'] in self._seen_ids:
+                log.info("Skipping already generated paper: %s", paper['title'])
+                continue
+            self._seen_ids.add(paper['id'])
+            indexed.append((i, paper))
+        
+        async def run():
+            sem = asyncio.Semaphore(max(1, self.concurrency))
+            
+            async def limited(chunk: List[Tuple[int, Dict]]):
+                async with sem:
+                    if len(chunk) == 1:
+                        i, paper = chunk[0]
+                        return [await self._generate_one(paper, article_name(i, paper), i, len(papers))]
+                    return await self._generate_chunk(chunk, article_name, len(papers))
+            
+            try:
+                chunks = [indexed[i:i + self.batch_size] for i in range(0, len(indexed), self.batch_size)]
+                return await asyncio.gather(*(limited(chunk) for chunk in chunks))
+            finally:
+                await self.generator.aclose()
+        
+        results = [result for chunk in asyncio.run(run()) for result in chunk]
+        
+        # Only successes count as seen, so failed papers are retried
+        for (_, paper), (article, _) in zip(indexed, results):
+            if article is None:
+                self._seen_ids.discard(paper['id'])
+        
+        return [article for article, _ in results if article is not None]
+    
+    async def _generate_one(self, paper: Dict, name: str, index: int,
+                            total: int) -> Tuple[Optional[Dict], str]:
+        """Generate and save a single article, returning it with its file path."""
+        article_file = str(self.articles_dir / f"{name}.json")
+        log.info("Generating article %d/%d: %s", index + 1, total, paper['title'])
+        try:
+            article = await self.generator.generate_article(paper)
+            return await self._save_generated(paper, article, article_file), article_file
+            
+        except Exception as e:
+            log.error("Error generating article for %s: %s", paper['title'], e)
+            return None, article_file
+    
+    async def _generate_chunk(self, chunk: List[Tuple[int, Dict]], article_name: Callable[[int, Dict], str],
+                              total: int) -> List[Tuple[Optional[Dict], str]]:
+        """Generate and save articles for a few papers with one batched request."""
+        for i, paper in chunk:
+            log.info("Generating article %d/%d: %s", i + 1, total, paper['title'])
+        
+        try:
+            articles = await self.generator.generate_articles_batch([paper for _, paper in chunk])
+        except Exception as e:
+            log.error("Error generating batched articles: %s", e)
+            articles = [None] * len(chunk)
+        
+        results = []
+        for (i, paper), article in zip(chunk, articles):
+            article_file = str(self.articles_dir / f"{article_name(i, paper)}.json")
+            if article is not None:
+                try:
+                    article = await self._save_generated(paper, article, article_file)
+                except Exception as e:
+                    log.error("Error saving article for %s: %s", paper['title'], e)
+                    article = None
+            results.append((article, article_file))
+        return results
+    
+    async def _save_generated(self, paper: Dict, article: Dict, article_file: str) -> Dict:
+        """Save an individual article and record it in the manifest."""
+        # Failed API calls come back as error text rather than raising; never
+        # publish those or let them mark the paper as seen
+        if is_error_article(article):
+            raise ValueError(f"OpenAI API error in generated article for {paper['id']}")
+        await self.generator.save_article_async(article, article_file)
+        self._record_article(article, article_file, paper['id'])
+        return article
+    
+    def _record_article(self, article: Dict, article_file: str, paper_id: str):
+        """Append a saved article to the manifest read by integrate_all_content."""
+        entry = orjson.dumps({"path": article_file, "publish_date": article['publish_date'], "id": paper_id},
+                             option=orjson.OPT_APPEND_NEWLINE)
+        with open(self.manifest_path, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(entry)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    async def _read_manifest(self) -> List[Dict]:
+        """
+        Read manifest entries, rebuilding the manifest from the articles directory
+        if it is missing or older than the directory.
+        """
+        if not self.articles_dir.exists():
+            return []
+        
+        if (self.manifest_path.exists() and
+                self.manifest_path.stat().st_mtime >= self.articles_dir.stat().st_mtime):
+            with open(self.manifest_path, 'rb') as f:
+                return [orjson.loads(line) for line in f if line.strip()]
+        
+        # Oldest first, so later files win when deduplicating
+        files = sorted((e for e in os.scandir(self.articles_dir) if e.name.endswith('.json')),
+                       key=lambda e: e.stat().st_mtime)
+        loaded = await _read_json_files([e.path for e in files])
+        
+        entries = [{"path": e.path, "publish_date": article.get('publish_date', ''),
+                    "id": article.get('paper_url', e.path).rsplit('/abs/', 1)[-1]}
+                   for e, article in zip(files, loaded) if article is not None]
+        
+        with open(self.manifest_path, 'wb') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.writelines(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in entries)
+        return entries
+    
+    def _read_daily_articles(self) -> List[Dict]:
+        """Read the articles appended by daily_automation, oldest first."""
+        if not self.daily_articles_path.exists():
+            return []
+        
+        with open(self.daily_articles_path, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
     
     def generate_classic_content(self):
         """Generate content for classic papers."""
-        print("=== Generating Classic Paper Content ===")
+        log.info("=== Generating Classic Paper Content ===")
         
         # Get classic papers
         papers = self.fetcher.get_classic_papers()
-        print(f"Found {len(papers)} classic papers")
+        log.info("Found %d classic papers", len(papers))
         
         # Save papers data
-        papers_file = f"{self.output_dir}/papers/classic_papers.json"
-        self.fetcher.save_papers_to_json(papers, papers_file)
+        self.fetcher.save_papers_to_json(papers, str(self.papers_dir / "classic_papers.json"))
         
         # Generate articles for classic papers
-        articles = []
-        for i, paper in enumerate(papers):
-            print(f"\nGenerating article {i+1}/{len(papers)}: {paper['title']}")
-            try:
-                article = self.generator.generate_article(paper)
-                articles.append(article)
-                
-                # Save individual article
-                article_file = f"{self.output_dir}/articles/classic_{paper['id'].replace('/', '_')}.json"
-                self.generator.save_article(article, article_file)
-                
-            except Exception as e:
-                print(f"Error generating article for {paper['title']}: {e}")
-                continue
+        articles = self._generate_articles(
+            papers, lambda i, paper: f"classic_{self._safe_id(paper['id'])}")
         
-        print(f"\nGenerated {len(articles)} articles successfully!")
+        log.info("Generated %d articles successfully!", len(articles))
         return articles
     
     def generate_recent_content(self, days: int = 7, max_papers: int = 5):
         """Generate content for recent papers."""
-        print(f"=== Generating Recent Paper Content (last {days} days) ===")
+        log.info("=== Generating Recent Paper Content (last %d days) ===", days)
         
         # Get recent papers
         papers = self.fetcher.get_recent_papers(days=days)[:max_papers]
-        print(f"Found {len(papers)} recent papers")
+        log.info("Found %d recent papers", len(papers))
         
         if not papers:
-            print("No recent papers found")
+            log.info("No recent papers found")
             return []
         
         # Save papers data
-        papers_file = f"{self.output_dir}/papers/recent_papers.json"
-        self.fetcher.save_papers_to_json(papers, papers_file)
+        self.fetcher.save_papers_to_json(papers, str(self.papers_dir / "recent_papers.json"))
         
         # Generate articles for recent papers
-        articles = []
-        for i, paper in enumerate(papers):
-            print(f"\nGenerating article {i+1}/{len(papers)}: {paper['title']}")
-            try:
-                article = self.generator.generate_article(paper)
-                articles.append(article)
-                
-                # Save individual article
-                article_file = f"{self.output_dir}/articles/recent_{paper['id'].replace('/', '_')}.json"
-                self.generator.save_article(article, article_file)
-                
-            except Exception as e:
-                print(f"Error generating article for {paper['title']}: {e}")
-                continue
+        articles = self._generate_articles(
+            papers, lambda i, paper: f"recent_{self._safe_id(paper['id'])}")
         
-        print(f"\nGenerated {len(articles)} articles successfully!")
+        log.info("Generated %d articles successfully!", len(articles))
         return articles
     
     def search_and_generate(self, query: str, category: str = None, max_results: int = 3):
         """Search for papers and generate articles."""
-        print(f"=== Searching and Generating Content for: {query} ===")
+        log.info("=== Searching and Generating Content for: %s ===", query)
         
         # Search for papers
         papers = self.fetcher.search_papers(query, max_results=max_results, category=category)
-        print(f"Found {len(papers)} papers")
+        log.info("Found %d papers", len(papers))
         
         if not papers:
-            print("No papers found for the query")
+            log.info("No papers found for the query")
             return []
         
         # Save papers data
         query_safe = query.replace(' ', '_').replace('/', '_')
-        papers_file = f"{self.output_dir}/papers/search_{query_safe}.json"
-        self.fetcher.save_papers_to_json(papers, papers_file)
+        self.fetcher.save_papers_to_json(papers, str(self.papers_dir / f"search_{query_safe}.json"))
         
         # Generate articles
-        articles = []
-        for i, paper in enumerate(papers):
-            print(f"\nGenerating article {i+1}/{len(papers)}: {paper['title']}")
-            try:
-                article = self.generator.generate_article(paper)
-                articles.append(article)
-                
-                # Save individual article
-                article_file = f"{self.output_dir}/articles/search_{query_safe}_{i+1}.json"
-                self.generator.save_article(article, article_file)
-                
-            except Exception as e:
-                print(f"Error generating article for {paper['title']}: {e}")
-                continue
+        articles = self._generate_articles(papers, lambda i, paper: f"search_{query_safe}_{i+1}")
         
-        print(f"\nGenerated {len(articles)} articles successfully!")
+        log.info("Generated %d articles successfully!", len(articles))
         return articles
     
-    def integrate_all_content(self):
-        """Integrate all generated articles into the blog."""
-        print("=== Integrating Content into Blog ===")
-        
-        # Collect all generated articles
-        articles = []
-        articles_dir = f"{self.output_dir}/articles"
-        
-        if os.path.exists(articles_dir):
-            for filename in os.listdir(articles_dir):
-                if filename.endswith('.json'):
-                    try:
-                        with open(os.path.join(articles_dir, filename), 'r', encoding='utf-8') as f:
-                            article = json.load(f)
-                            articles.append(article)
-                    except Exception as e:
-                        print(f"Error loading {filename}: {e}")
+    def integrate_all_content(self, max_articles: Optional[int] = None):
+        """
+        Integrate generated articles into the blog.
         
-        if articles:
-            # Sort articles by publication date (newest first)
-            articles.sort(key=lambda x: x.get('publish_date', ''), reverse=True)
+        Args:
+            max_articles: Only integrate this many of the newest articles (all if None)
             
+        Returns:
+            List of integrated articles, newest first
+        """
+        return asyncio.run(self._integrate_all_content_async(max_articles))
+    
+    async def _integrate_all_content_async(self, max_articles: Optional[int] = None) -> List[Dict]:
+        log.info("=== Integrating Content into Blog ===")
+        
+        # Keep the latest manifest entry for each paper
+        latest = {}
+        for entry in await self._read_manifest():
+            latest[entry['id']] = entry
+        
+        # Daily articles live in one JSONL file rather than the articles directory
+        for article in self._read_daily_articles():
+            entry = {"article": article, "publish_date": article.get('publish_date', ''),
+                     "id": article['paper_id']}
+            if entry['id'] not in latest or entry['publish_date'] >= latest[entry['id']]['publish_date']:
+                latest[entry['id']] = entry
+        
+        # Sort by publication date (newest first) before loading anything
+        publish_date = itemgetter('publish_date')
+        if max_articles is None:
+            entries = sorted(latest.values(), key=publish_date, reverse=True)
+        else:
+            entries = heapq.nlargest(max_articles, latest.values(), key=publish_date)
+        
+        paths = [entry['path'] for entry in entries if 'path' in entry]
+        loaded = iter(await _read_json_files(paths))
+        articles = [entry['article'] if 'article' in entry else next(loaded) for entry in entries]
+        articles = [article for article in articles if article is not None]
+        
+        if articles:
             # Integrate into blog
             self.manager.integrate_articles(articles)
-            print(f"Successfully integrated {len(articles)} articles into the blog!")
+            log.info("Successfully integrated %d articles into the blog!", len(articles))
             
             return articles
         else:
-            print("No articles found to integrate")
+            log.info("No articles found to integrate")
             return []
     
-    def full_automation(self, include_recent: bool = False):
+    def full_automation(self, include_recent: bool = False, max_integrate: Optional[int] = None):
         """Run full automation pipeline."""
-        print("=== Starting Full Blog Automation ===")
-        start_time = datetime.now()
+        log.info("=== Starting Full Blog Automation ===")
+        start_ns = time.perf_counter_ns()
         
         all_articles = []
         
@@ -178,45 +348,47 @@ class BlogAutomation:
             recent_articles = self.generate_recent_content()
             all_articles.extend(recent_articles)
         
-        # Integrate all content
-        if all_articles:
-            self.integrate_all_content()
+        # Integrate all content, including articles saved by earlier runs
+        self.integrate_all_content(max_integrate)
         
-        end_time = datetime.now()
-        duration = end_time - start_time
+        duration_s = (time.perf_counter_ns() - start_ns) / 1e9
         
-        print(f"\n=== Automation Complete ===")
-        print(f"Total articles generated: {len(all_articles)}")
-        print(f"Duration: {duration}")
-        print(f"Blog path: {self.blog_path}")
+        log.info("=== Automation Complete ===")
+        log.info("Total articles generated: %d", len(all_articles))
+        log.info("Duration: %.2fs", duration_s)
+        log.info("Blog path: %s", self.blog_path)
         
         return all_articles
     
     def create_sample_article(self, paper_id: str = "1706.03762"):
         """Create a single sample article for testing."""
-        print(f"=== Creating Sample Article for Paper ID: {paper_id} ===")
+        log.info("=== Creating Sample Article for Paper ID: %s ===", paper_id)
         
         # Get the specific paper
-        classic_papers = self.fetcher.get_classic_papers()
-        paper = next((p for p in classic_papers if p['id'] == paper_id), None)
+        if self._classic_papers_by_id is None:
+            self._classic_papers_by_id = {p['id']: p for p in self.fetcher.get_classic_papers()}
+        paper = self._classic_papers_by_id.get(paper_id)
         
         if not paper:
-            print(f"Paper with ID {paper_id} not found in classic papers")
+            log.warning("Paper with ID %s not found in classic papers", paper_id)
             return None
         
         # Generate article
         try:
-            article = self.generator.generate_article(paper)
+            article = self.generator.generate_article_sync(paper)
+            if is_error_article(article):
+                raise ValueError(f"OpenAI API error in generated article for {paper['id']}")
             
             # Save article
-            article_file = f"{self.output_dir}/articles/sample_{paper_id.replace('/', '_')}.json"
+            article_file = str(self.articles_dir / f"sample_{self._safe_id(paper_id)}.json")
             self.generator.save_article(article, article_file)
+            self._record_article(article, article_file, paper['id'])
             
-            print(f"Sample article generated successfully: {article_file}")
+            log.info("Sample article generated successfully: %s", article_file)
             return article
             
         except Exception as e:
-            print(f"Error generating sample article: {e}")
+            log.error("Error generating sample article: %s", e)
             return None
 
 def main():
@@ -227,16 +399,33 @@ def main():
     parser.add_argument('--query', type=str, help='Search query for papers')
     parser.add_argument('--category', type=str, help='arXiv category (e.g., cs.LG, cs.CL)')
     parser.add_argument('--max-results', type=int, default=3, help='Maximum number of results')
+    parser.add_argument('--max-integrate', type=int, default=None,
+                       help='Only integrate the newest N articles into the blog')
     parser.add_argument('--days', type=int, default=7, help='Days to look back for recent papers')
     parser.add_argument('--blog-path', type=str, default='/home/ubuntu/ai-paper-blog', 
                        help='Path to the blog directory')
     parser.add_argument('--paper-id', type=str, default='1706.03762', 
                        help='Paper ID for sample generation')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Only report warnings and errors')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Maximum number of articles generated at once')
+    parser.add_argument('--batch-size', type=int, default=1,
+                       help='Papers explained per API request (1 sends one request per paper)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always regenerate articles instead of reusing cached ones')
+    parser.add_argument('--cache-threshold', type=float, default=0.92,
+                       help='Cosine similarity needed to reuse a cached article for another version of the same paper')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format='%(asctime)s %(message)s')
+    
     # Initialize automation
-    automation = BlogAutomation(args.blog_path)
+    automation = BlogAutomation(args.blog_path, concurrency=args.concurrency,
+                                use_cache=not args.no_cache, cache_threshold=args.cache_threshold,
+                                batch_size=args.batch_size)
     
     try:
         if args.mode == 'classic':
@@ -245,22 +434,22 @@ def main():
             automation.generate_recent_content(days=args.days, max_papers=args.max_results)
         elif args.mode == 'search':
             if not args.query:
-                print("Error: --query is required for search mode")
+                log.error("Error: --query is required for search mode")
                 sys.exit(1)
             automation.search_and_generate(args.query, args.category, args.max_results)
         elif args.mode == 'integrate':
-            automation.integrate_all_content()
+            automation.integrate_all_content(args.max_integrate)
         elif args.mode == 'full':
-            automation.full_automation(include_recent=True)
+            automation.full_automation(include_recent=True, max_integrate=args.max_integrate)
         elif args.mode == 'sample':
             automation.create_sample_article(args.paper_id)
         
-        print("\nAutomation completed successfully!")
+        log.info("Automation completed successfully!")
         
     except KeyboardInterrupt:
-        print("\nAutomation interrupted by user")
+        log.warning("Automation interrupted by user")
     except Exception as e:
-        print(f"\nError during automation: {e}")
+        log.error("Error during automation: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
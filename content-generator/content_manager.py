@@ -4,108 +4,184 @@ Content Manager
 Manages the integration of generated articles into the React blog.
 """
 
-import json
+import contextlib
+import functools
+import mmap
 import os
 import shutil
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterator, List
 from datetime import datetime
 import re
 
-class ContentManager:
-    def __init__(self, blog_path: str = "../../ai-paper-blog"):
-        # Resolve the absolute path based on the script's location
-        script_dir = os.path.dirname(__file__)
-        self.blog_path = os.path.abspath(os.path.join(script_dir, blog_path))
-        self.articles_dir = os.path.join(self.blog_path, "src", "data")
-        self.ensure_directories()
-    
-    def ensure_directories(self):
-        """Ensure necessary directories exist."""
-        os.makedirs(self.articles_dir, exist_ok=True)
-    
-    def integrate_articles(self, articles: List[Dict]):
-        """
-        Integrate generated articles into the React blog.
-        
-        Args:
-            articles: List of article dictionaries from ArticleGenerator
-        """
-        print(f"Integrating {len(articles)} articles into the blog...")
-        
-        # Create articles data file
-        articles_data = []
-        
-        for article in articles:
-            # Create article data structure for React
-            article_data = {
-                "id": self._create_article_id(article["title"]),
-                "title": article["title"],
-                "subtitle": article["subtitle"],
-                "category": article["category"],
-                "categorySlug": self._get_category_slug(article["category"]),
-                "authors": article["authors"],
-                "paperUrl": article["paper_url"],
-                "readTime": article["read_time"],
-                "publishDate": article["publish_date"],
-                "conceptExplained": article["concept_explained"],
-                "content": article["content"],
-                "conceptExplanation": article["concept_explanation"],
-                "summary": article["summary"],
-                "excerpt": self._create_excerpt(article["content"]["background"])
-            }
-            
-            articles_data.append(article_data)
-        
-        # Save articles data
-        articles_file = os.path.join(self.articles_dir, "articles.json")
-        with open(articles_file, 'w', encoding='utf-8') as f:
-            json.dump(articles_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Articles data saved to {articles_file}")
-        
-        # Update React components to use the data
-        self._update_react_components()
-        
-        return articles_data
+import orjson
+
+# articles.json is only read by the React app, so it is written compactly unless
+# BLOG_PRETTY_JSON=1 is set for debugging
+PRETTY_JSON = os.environ.get("BLOG_PRETTY_JSON") == "1"
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Daily articles are appended here, one JSON document per line
+GENERATED_ARTICLES_FILE = "generated_content/articles.jsonl"
+
+# Files above this size are parsed from a memory map; mapping costs more than copying small files
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def dumps_json(data, pretty: bool = PRETTY_JSON) -> bytes:
+    """Serialize data to UTF-8 JSON."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0))
+
+
+def load_json(path: str):
+    """Load a JSON file."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > MMAP_MIN_SIZE:
+            # Let orjson parse the mapped page cache directly instead of a copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return orjson.loads(f.read())
+
+
+def _write_all(fd: int, data):
+    """Write all of data to a file descriptor, retrying after short writes."""
+    with memoryview(data) as view:
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+
+def _fsync_dir(path: str):
+    """Sync a directory so a rename inside it survives a crash (a no-op where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    """
+    Write content to path unless the file already holds exactly that content.
     
-    def _create_article_id(self, title: str) -> str:
-        """Create a URL-friendly article ID from title."""
-        # Extract the paper title part (after "Paper Explained: ")
-        if "Paper Explained: " in title:
-            paper_title = title.split("Paper Explained: ")[1]
-            if " - " in paper_title:
-                paper_title = paper_title.split(" - ")[0]
-        else:
-            paper_title = title
-        
-        # Convert to slug
-        slug = re.sub(r'[^\w\s-]', '', paper_title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug)
-        return slug.strip('-')
+    Leaving unchanged files alone avoids needless dev-server reloads and rebuilds.
     
-    def _get_category_slug(self, category: str) -> str:
-        """Convert category display name to slug."""
-        category_map = {
-            'Foundation Models': 'foundation-models',
-            'Generative Models': 'generative-models',
-            'Optimization': 'optimization',
-            'Applications': 'applications',
-            'Basic Concepts': 'basic-concepts'
-        }
-        return category_map.get(category, 'basic-concepts')
+    Returns:
+        True if the file was written
+    """
+    data = content.encode('utf-8')
+    try:
+        if os.stat(path).st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
     
-    def _create_excerpt(self, background: str) -> str:
-        """Create a short excerpt from the background section."""
-        sentences = background.split('. ')
-        if len(sentences) >= 2:
-            return '. '.join(sentences[:2]) + '.'
-        return background[:200] + '...' if len(background) > 200 else background
+    _atomic_write(path, data)
+    return True
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write data to a temporary file, sync it and rename it over path."""
+    tmp_path = path + ".tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+SLUG_STRIP = re.compile(r'[^\w\s-]')
+SLUG_DASH = re.compile(r'[-\s]+')
+
+
+@functools.lru_cache(maxsize=1024)
+def _article_id(title: str) -> str:
+    """Slug for an article title; cached because the same titles recur across regenerations."""
+    # Extract the paper title part (after "Paper Explained: ")
+    if "Paper Explained: " in title:
+        paper_title = title.split("Paper Explained: ")[1]
+        if " - " in paper_title:
+            paper_title = paper_title.split(" - ")[0]
+    else:
+        paper_title = title
     
-    def _update_react_components(self):
-        """Update React components to use dynamic data instead of hardcoded content."""
-        
-        # Create data loader utility
-        data_loader_content = '''import articlesData from './articles.json';
+    # Convert to slug
+    slug = SLUG_STRIP.sub('', paper_title.lower())
+    slug = SLUG_DASH.sub('-', slug)
+    return slug.strip('-')
+
+
+# Single source for the blog's categories: the category name articles carry,
+# and the name, description and icon shown on the category page
+CATEGORIES = MappingProxyType({
+    'foundation-models': MappingProxyType({
+        'category': 'Foundation Models',
+        'name': 'Foundation Models & LLMs',
+        'description': 'Explore the architectures that power modern AI systems, from Transformers to GPT and BERT.',
+        'icon': '\U0001f3d7\ufe0f',
+    }),
+    'generative-models': MappingProxyType({
+        'category': 'Generative Models',
+        'name': 'Generative Models',
+        'description': 'Understand how AI creates new content, from GANs to Diffusion Models and VAEs.',
+        'icon': '\U0001f3a8',
+    }),
+    'optimization': MappingProxyType({
+        'category': 'Optimization',
+        'name': 'Optimization & Efficiency',
+        'description': 'Learn about techniques that make AI models faster, smaller, and more efficient.',
+        'icon': '\u26a1',
+    }),
+    'applications': MappingProxyType({
+        'category': 'Applications',
+        'name': 'AI Applications',
+        'description': 'Discover how AI is being applied in healthcare, robotics, education, and beyond.',
+        'icon': '\U0001f680',
+    }),
+    'basic-concepts': MappingProxyType({
+        'category': 'Basic Concepts',
+        'name': 'Basic Concepts',
+        'description': 'Master the fundamental building blocks of artificial intelligence and machine learning.',
+        'icon': '\U0001f4da',
+    }),
+})
+
+CATEGORY_SLUGS = MappingProxyType({info['category']: slug for slug, info in CATEGORIES.items()})
+
+
+def _js_string(value: str) -> str:
+    """Quote a string as a single-quoted JavaScript literal."""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+# Body of the categoryInfo object literal in CategoryPage.jsx
+CATEGORY_INFO_JS = ",\n".join(
+    f"    {_js_string(slug)}: {{\n"
+    f"      name: {_js_string(info['name'])},\n"
+    f"      description: {_js_string(info['description'])},\n"
+    f"      icon: {_js_string(info['icon'])}\n"
+    f"    }}"
+    for slug, info in CATEGORIES.items()
+)
+
+# Generated React sources, written verbatim into the blog on every integration
+DATA_LOADER_JS = '''import articlesData from './articles.json';
 
 export const getArticles = () => {
   return articlesData;
@@ -138,25 +214,8 @@ export const getCategories = () => {
   return Object.values(categories);
 };
 '''
-        
-        data_loader_path = os.path.join(self.articles_dir, "dataLoader.js")
-        with open(data_loader_path, 'w', encoding='utf-8') as f:
-            f.write(data_loader_content)
-        
-        print(f"Data loader created at {data_loader_path}")
-        
-        # Update HomePage component
-        self._update_homepage_component()
-        
-        # Update ArticlePage component
-        self._update_article_page_component()
-        
-        # Update CategoryPage component
-        self._update_category_page_component()
-    
-    def _update_homepage_component(self):
-        """Update HomePage component to use dynamic data."""
-        homepage_content = '''import { Link } from 'react-router-dom'
+
+HOMEPAGE_JSX = '''import { Link } from 'react-router-dom'
 import { Calendar, Clock, ArrowRight, BookOpen, Users, Target } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
@@ -305,16 +364,8 @@ const HomePage = () => {
 }
 
 export default HomePage'''
-        
-        homepage_path = os.path.join(self.blog_path, "src", "components", "HomePage.jsx")
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(homepage_content)
-        
-        print("Updated HomePage component to use dynamic data")
-    
-    def _update_article_page_component(self):
-        """Update ArticlePage component to use dynamic data."""
-        article_page_content = '''import { useParams, Link } from 'react-router-dom'
+
+ARTICLE_PAGE_JSX = '''import { useParams, Link } from 'react-router-dom'
 import { Calendar, Clock, ArrowLeft, BookOpen, Lightbulb, Target, TrendingUp } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
@@ -498,16 +549,8 @@ const ArticlePage = () => {
 }
 
 export default ArticlePage'''
-        
-        article_page_path = os.path.join(self.blog_path, "src", "components", "ArticlePage.jsx")
-        with open(article_page_path, 'w', encoding='utf-8') as f:
-            f.write(article_page_content)
-        
-        print("Updated ArticlePage component to use dynamic data")
-    
-    def _update_category_page_component(self):
-        """Update CategoryPage component to use dynamic data."""
-        category_page_content = '''import { useParams, Link } from 'react-router-dom'
+
+CATEGORY_PAGE_JSX = '''import { useParams, Link } from 'react-router-dom'
 import { Calendar, Clock, ArrowLeft, BookOpen, ArrowRight } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
@@ -521,31 +564,7 @@ const CategoryPage = () => {
 
   // Category information
   const categoryInfo = {
-    'foundation-models': {
-      name: 'Foundation Models & LLMs',
-      description: 'Explore the architectures that power modern AI systems, from Transformers to GPT and BERT.',
-      icon: '🏗️'
-    },
-    'generative-models': {
-      name: 'Generative Models',
-      description: 'Understand how AI creates new content, from GANs to Diffusion Models and VAEs.',
-      icon: '🎨'
-    },
-    'optimization': {
-      name: 'Optimization & Efficiency',
-      description: 'Learn about techniques that make AI models faster, smaller, and more efficient.',
-      icon: '⚡'
-    },
-    'applications': {
-      name: 'AI Applications',
-      description: 'Discover how AI is being applied in healthcare, robotics, education, and beyond.',
-      icon: '🚀'
-    },
-    'basic-concepts': {
-      name: 'Basic Concepts',
-      description: 'Master the fundamental building blocks of artificial intelligence and machine learning.',
-      icon: '📚'
-    }
+''' + CATEGORY_INFO_JS + '''
   }
 
   const currentCategory = categoryInfo[category] || {
@@ -668,12 +687,141 @@ const CategoryPage = () => {
 }
 
 export default CategoryPage'''
+
+
+class ContentManager:
+    def __init__(self, blog_path: str = "../../ai-paper-blog"):
+        # Resolve the absolute path based on the script's location
+        script_dir = os.path.dirname(__file__)
+        self.blog_path = os.path.abspath(os.path.join(script_dir, blog_path))
+        self.articles_dir = os.path.join(self.blog_path, "src", "data")
+        components_dir = os.path.join(self.blog_path, "src", "components")
+        self._articles_file = os.path.join(self.articles_dir, "articles.json")
+        self._data_loader_path = os.path.join(self.articles_dir, "dataLoader.js")
+        self._homepage_path = os.path.join(components_dir, "HomePage.jsx")
+        self._article_page_path = os.path.join(components_dir, "ArticlePage.jsx")
+        self._category_page_path = os.path.join(components_dir, "CategoryPage.jsx")
+        self.ensure_directories()
+    
+    def ensure_directories(self):
+        """Ensure necessary directories exist."""
+        os.makedirs(self.articles_dir, exist_ok=True)
+    
+    def integrate_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Integrate generated articles into the React blog.
+        
+        articles.json is encoded one article at a time, so the encoded JSON for
+        the whole list is never held in memory at once.
+        
+        Args:
+            articles: List of article dictionaries from ArticleGenerator
+            
+        Returns:
+            The React data structure written for each article
+        """
+        print(f"Integrating {len(articles)} articles into the blog...")
+        
+        # Save articles data
+        articles_file = self._articles_file
+        separator = b',\n' if PRETTY_JSON else b','
+        articles_data = []
+        # Encode into one buffer and hand it to the kernel with raw os.write
+        # calls, flushing whenever the buffer grows past WRITE_BUFFER_SIZE.
+        # The data goes to a temporary file that replaces articles.json only
+        # once it is complete and synced, so a crash never leaves it truncated.
+        buffer = bytearray(b'[')
+        tmp_file = articles_file + ".tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                for article_data in self._iter_article_dicts(articles):
+                    if articles_data:
+                        buffer += separator
+                    buffer += dumps_json(article_data)
+                    articles_data.append(article_data)
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        _write_all(fd, buffer)
+                        buffer.clear()
+                buffer += b']'
+                _write_all(fd, buffer)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, articles_file)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_file)
+            raise
+        _fsync_dir(self.articles_dir)
+        
+        print(f"Articles data saved to {articles_file}")
+        
+        # Update React components to use the data
+        self._update_react_components()
+        
+        return articles_data
+    
+    def _iter_article_dicts(self, articles: List[Dict]) -> Iterator[Dict]:
+        """Yield the React data structure for each article."""
+        # Bind the helpers once rather than per article
+        create_id = self._create_article_id
+        category_slug = self._get_category_slug
+        create_excerpt = self._create_excerpt
+        for article in articles:
+            content = article["content"]
+            yield {
+                "id": create_id(article["title"]),
+                "title": article["title"],
+                "subtitle": article["subtitle"],
+                "category": article["category"],
+                "categorySlug": category_slug(article["category"]),
+                "authors": article["authors"],
+                "paperUrl": article["paper_url"],
+                "readTime": article["read_time"],
+                "publishDate": article["publish_date"],
+                "conceptExplained": article["concept_explained"],
+                "content": content,
+                "conceptExplanation": article["concept_explanation"],
+                "summary": article["summary"],
+                "excerpt": create_excerpt(content["background"])
+            }
+    
+    def _create_article_id(self, title: str) -> str:
+        """Create a URL-friendly article ID from title."""
+        return _article_id(title)
+    
+    def _get_category_slug(self, category: str) -> str:
+        """Convert category display name to slug."""
+        return CATEGORY_SLUGS.get(category, 'basic-concepts')
+    
+    def _create_excerpt(self, background: str) -> str:
+        """Create a short excerpt from the background section."""
+        # Find the end of the second sentence without splitting the whole text
+        first = background.find('. ')
+        if first == -1:
+            return background[:200] + '...' if len(background) > 200 else background
+        second = background.find('. ', first + 2)
+        if second == -1:
+            return background + '.'
+        return background[:second + 1]
+    
+    def _update_react_components(self):
+        """Update React components to use dynamic data instead of hardcoded content."""
+        outputs = [
+            (self._data_loader_path, DATA_LOADER_JS, f"Data loader created at {self._data_loader_path}"),
+            (self._homepage_path, HOMEPAGE_JSX, "Updated HomePage component to use dynamic data"),
+            (self._article_page_path, ARTICLE_PAGE_JSX, "Updated ArticlePage component to use dynamic data"),
+            (self._category_page_path, CATEGORY_PAGE_JSX, "Updated CategoryPage component to use dynamic data"),
+        ]
         
-        category_page_path = os.path.join(self.blog_path, "src", "components", "CategoryPage.jsx")
-        with open(category_page_path, 'w', encoding='utf-8') as f:
-            f.write(category_page_content)
+        # The files are independent, so write them concurrently
+        with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+            written = list(executor.map(lambda output: _write_if_changed(output[0], output[1]), outputs))
         
-        print("Updated CategoryPage component to use dynamic data")
+        for (_, _, message), was_written in zip(outputs, written):
+            if was_written:
+                print(message)
     
     def integrate_articles_to_blog(self, new_articles):
         """
@@ -684,12 +832,11 @@ export default CategoryPage'''
         """
         try:
             # Load existing articles
-            articles_file = os.path.join(self.articles_dir, 'articles.json')
+            articles_file = self._articles_file
             existing_articles = []
             
             if os.path.exists(articles_file):
-                with open(articles_file, 'r', encoding='utf-8') as f:
-                    existing_articles = json.load(f)
+                existing_articles = load_json(articles_file)
             
             # Convert new articles to the correct format
             formatted_articles = []
@@ -732,12 +879,14 @@ export default CategoryPage'''
                     # If no ID found, add anyway (for older articles)
                     unique_articles.append(article)
             
-            # Sort articles by date (most recent first)
-            unique_articles.sort(key=lambda x: x.get('publishDate', ''), reverse=True)
+            # Sort articles by date (most recent first), via indices into a flat key list
+            dates = [article.get('publishDate', '') for article in unique_articles]
+            order = sorted(range(len(unique_articles)), key=dates.__getitem__, reverse=True)
+            unique_articles = [unique_articles[i] for i in order]
             
-            # Save updated articles
-            with open(articles_file, 'w', encoding='utf-8') as f:
-                json.dump(unique_articles, f, indent=2, ensure_ascii=False)
+            # Save updated articles; a crash mid-write must not truncate the published data
+            _atomic_write(articles_file, dumps_json(unique_articles, pretty=True))
+            _fsync_dir(os.path.dirname(articles_file))
             
             print(f"Successfully integrated {len(formatted_articles)} new articles. Total articles: {len(unique_articles)}")
             
@@ -753,11 +902,11 @@ def main():
         articles = []
         articles_dir = "articles"
         if os.path.exists(articles_dir):
-            for filename in os.listdir(articles_dir):
-                if filename.endswith('.json'):
-                    with open(os.path.join(articles_dir, filename), 'r', encoding='utf-8') as f:
-                        article = json.load(f)
-                        articles.append(article)
+            with os.scandir(articles_dir) as it:
+                paths = [entry.path for entry in it if entry.name.endswith('.json')]
+            # The reads are independent, so overlap them in threads
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                articles = list(executor.map(load_json, paths))
         
         if articles:
             manager.integrate_articles(articles)
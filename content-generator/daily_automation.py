@@ -6,52 +6,205 @@ Automatically generates new AI/ML paper articles and integrates them into the bl
 
 import os
 import sys
-import json
+import hashlib
+import math
+import mmap
+import sqlite3
+import struct
 from datetime import datetime, timedelta
+
+import orjson
+
 from enhanced_arxiv_fetcher import EnhancedArxivFetcher
 from article_generator import ArticleGenerator
-from content_manager import ContentManager
+from content_manager import ContentManager, GENERATED_ARTICLES_FILE, dumps_json
+
+# Minimum number of paper IDs the Bloom filter is sized for, and its target false-positive rate
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 1e-4
+
+def _paper_id_of(article):
+    """Return the arXiv ID an article covers, from its paper_id field or arXiv URL."""
+    if 'paper_id' in article:
+        return article['paper_id']
+    if 'url' in article and 'arxiv.org/abs/' in article['url']:
+        return article['url'].split('/')[-1]
+    return None
+
+class ArticleIndex:
+    """
+    SQLite index of the papers already published in articles.json.
+    
+    The index remembers the mtime of the articles.json it was built from and is
+    only rebuilt when that file changes, so duplicate checks don't need to
+    decode the whole blog on every run.
+    """
+    
+    def __init__(self, path: str = "generated_content/cache/index.sqlite"):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        if "json" in columns:
+            # Older indexes also stored each article; drop them so the next refresh rebuilds
+            self._conn.execute("DROP TABLE articles")
+            self._conn.execute("DELETE FROM meta")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS articles (paper_id TEXT PRIMARY KEY)")
+        self._conn.commit()
+    
+    def source_mtime(self):
+        """Return the articles.json mtime (ns) the index was last synced with, or None."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'source_mtime'").fetchone()
+        return row[0] if row else None
+    
+    def rebuild(self, articles, source_mtime: int):
+        """Replace the index contents with the given articles."""
+        with self._conn:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO articles (paper_id) VALUES (?)",
+                ((paper_id,) for article in articles if (paper_id := _paper_id_of(article))),
+            )
+            self._set_source_mtime(source_mtime)
+    
+    def add(self, articles, source_mtime: int):
+        """Record the papers of newly integrated articles."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO articles (paper_id) VALUES (?)",
+                ((article['paper_id'],) for article in articles),
+            )
+            self._set_source_mtime(source_mtime)
+    
+    def _set_source_mtime(self, source_mtime: int):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('source_mtime', ?)", (source_mtime,)
+        )
+    
+    def paper_ids(self):
+        return (row[0] for row in self._conn.execute("SELECT paper_id FROM articles"))
+    
+    def has(self, paper_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM articles WHERE paper_id = ?", (paper_id,)).fetchone() is not None
+    
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    
+    def close(self):
+        self._conn.close()
+
+class IdBloomFilter:
+    """
+    Memory-mapped Bloom filter of published paper IDs.
+    
+    The file holds an 8-byte header with the articles.json mtime the filter was
+    built from, followed by the bit array. A miss means the ID is certainly
+    new; a hit still has to be confirmed against the ArticleIndex.
+    """
+    
+    HEADER = struct.Struct("<q")
+    
+    def __init__(self, path: str = "generated_content/cache/ids.bloom",
+                 capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = self.HEADER.size + (self.num_bits + 7) // 8
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                # New file, or sized for a different capacity: start over empty
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+    
+    def _positions(self, paper_id: str):
+        digest = hashlib.blake2b(paper_id.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        offset = self.HEADER.size * 8
+        return ((h1 + i * h2) % self.num_bits + offset for i in range(self.num_hashes))
+    
+    def __contains__(self, paper_id: str) -> bool:
+        bits = self._map
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(paper_id))
+    
+    def add(self, paper_id: str):
+        bits = self._map
+        for pos in self._positions(paper_id):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def source_mtime(self) -> int:
+        return self.HEADER.unpack_from(self._map)[0]
+    
+    def rebuild(self, paper_ids, source_mtime: int):
+        """Reset the filter to exactly the given IDs."""
+        self._map[self.HEADER.size:] = bytes(len(self._map) - self.HEADER.size)
+        for paper_id in paper_ids:
+            self.add(paper_id)
+        self.mark_synced(source_mtime)
+    
+    def mark_synced(self, source_mtime: int):
+        self.HEADER.pack_into(self._map, 0, source_mtime)
+        self._map.flush()
+    
+    def close(self):
+        self._map.close()
 
 class DailyAutomation:
     def __init__(self, blog_app_path: str):
         self.fetcher = EnhancedArxivFetcher()
         self.generator = ArticleGenerator()
         self.content_manager = ContentManager(blog_path=blog_app_path)
+        self.index = ArticleIndex()
+        self.bloom = IdBloomFilter(capacity=max(BLOOM_CAPACITY, 2 * self.index.count()))
         self.max_daily_articles = 2  # Limit to 2 new articles per day
+    
+    def _articles_file(self):
+        return os.path.join(self.content_manager.articles_dir, "articles.json")
+    
+    def _articles_mtime(self):
+        try:
+            return os.stat(self._articles_file()).st_mtime_ns
+        except OSError:
+            return 0
+    
+    def refresh_index(self):
+        """Rebuild the article index and Bloom filter if articles.json changed since the last sync."""
+        mtime = self._articles_mtime()
+        if self.index.source_mtime() != mtime:
+            self.index.rebuild(self.load_existing_articles(), mtime)
+        if self.bloom.source_mtime() != mtime:
+            self.bloom.rebuild(self.index.paper_ids(), mtime)
+    
+    def is_known_paper(self, paper_id: str) -> bool:
+        """Whether a paper is already published; the Bloom filter answers most misses without SQLite."""
+        return paper_id in self.bloom and self.index.has(paper_id)
         
     def load_existing_articles(self):
         """Load existing articles to avoid duplicates."""
         try:
-            articles_file = os.path.join(self.content_manager.articles_dir, "articles.json")
+            articles_file = self._articles_file()
             if os.path.exists(articles_file):
-                with open(articles_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(articles_file, 'rb') as f:
+                    return orjson.loads(f.read())
             return []
         except Exception as e:
             print(f"Error loading existing articles: {e}")
             return []
     
-    def get_existing_paper_ids(self, articles):
-        """Extract paper IDs from existing articles."""
-        existing_ids = set()
-        for article in articles:
-            # Extract arXiv ID from URL or paper_id field
-            if 'paper_id' in article:
-                existing_ids.add(article['paper_id'])
-            elif 'url' in article and 'arxiv.org/abs/' in article['url']:
-                paper_id = article['url'].split('/')[-1]
-                existing_ids.add(paper_id)
-        return existing_ids
-    
     def find_new_papers(self):
         """Find new papers that haven't been covered yet."""
         print("Searching for new papers...")
         
-        # Load existing articles
-        existing_articles = self.load_existing_articles()
-        existing_ids = self.get_existing_paper_ids(existing_articles)
+        # Index existing articles (only re-reads articles.json when it changed)
+        self.refresh_index()
         
-        print(f"Found {len(existing_ids)} existing articles")
+        print(f"Found {self.index.count()} existing articles")
         
         # Search for recent papers
         recent_papers = self.fetcher.search_recent_papers(
@@ -63,7 +216,7 @@ class DailyAutomation:
         # Filter out papers we already have
         new_papers = []
         for paper in recent_papers:
-            if paper['id'] not in existing_ids:
+            if not self.is_known_paper(paper['id']):
                 new_papers.append(paper)
         
         print(f"Found {len(new_papers)} new papers")
@@ -81,7 +234,7 @@ class DailyAutomation:
                 print(f"Generating article for: {paper['title']}")
                 
                 # Generate article
-                article_data = self.generator.generate_article(paper)
+                article_data = self.generator.generate_article_sync(paper)
                 if article_data:
                     # Add paper metadata
                     article_data['paper_id'] = paper['id']
@@ -100,14 +253,12 @@ class DailyAutomation:
         return generated_articles
     
     def save_generated_articles(self, articles):
-        """Save generated articles to individual JSON files."""
-        os.makedirs('generated_content/articles', exist_ok=True)
+        """Append generated articles to the daily JSONL file in a single write."""
+        os.makedirs(os.path.dirname(GENERATED_ARTICLES_FILE), exist_ok=True)
         
-        for article in articles:
-            filename = f"generated_content/articles/daily_{article['paper_id']}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(article, f, indent=2, ensure_ascii=False)
-            print(f"Saved article to {filename}")
+        with open(GENERATED_ARTICLES_FILE, 'ab') as f:
+            f.write(b''.join(dumps_json(article, pretty=False) + b"\n" for article in articles))
+        print(f"Appended {len(articles)} articles to {GENERATED_ARTICLES_FILE}")
     
     def integrate_articles(self, articles):
         """Integrate new articles into the blog."""
@@ -118,6 +269,11 @@ class DailyAutomation:
         try:
             # Use content manager to integrate articles
             self.content_manager.integrate_articles_to_blog(articles)
+            mtime = self._articles_mtime()
+            self.index.add(articles, mtime)
+            for article in articles:
+                self.bloom.add(article['paper_id'])
+            self.bloom.mark_synced(mtime)
             print(f"Successfully integrated {len(articles)} new articles into blog")
         except Exception as e:
             print(f"Error integrating articles: {e}")
@@ -156,6 +312,10 @@ class DailyAutomation:
         except Exception as e:
             print(f"Error during daily update: {e}")
             sys.exit(1)
+        finally:
+            self.index.close()
+            self.bloom.close()
+            self.fetcher.close()
 
 def main():
     """Main function for daily automation."""
@@ -4,69 +4,285 @@ Enhanced ArXiv Paper Fetcher
 Enhanced version with better recent paper search, relevance scoring, and figure generation support.
 """
 
-import arxiv
-import requests
+import asyncio
+import functools
+import heapq
+import io
+import os
+import aiohttp
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
 import time
-from typing import List, Dict, Optional
+from itertools import repeat
+from types import MappingProxyType
+from typing import List, Dict, NamedTuple, Optional
 import re
+import sqlite3
+from urllib.parse import urlencode
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+import orjson
+
+# Atom element names in Clark notation
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_SUMMARY = f"{ATOM_NS}summary"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+ATOM_UPDATED = f"{ATOM_NS}updated"
+ATOM_ID = f"{ATOM_NS}id"
+ATOM_AUTHOR = f"{ATOM_NS}author"
+ATOM_NAME = f"{ATOM_NS}name"
+ATOM_CATEGORY = f"{ATOM_NS}category"
+ATOM_LINK = f"{ATOM_NS}link"
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=3.05, sock_read=30)
+
+# Cached feeds younger than this are served without contacting arXiv; older ones are revalidated
+FEED_CACHE_TTL = 3600
+
+# Longest Retry-After (seconds) we are willing to wait out before giving up on a query
+MAX_RETRY_AFTER = 60
+
+# Transient failures (connection errors, 5xx) are retried this many times, backing
+# off from RETRY_DELAY seconds; each query is a single page, so there is no paging delay
+NUM_RETRIES = 3
+RETRY_DELAY = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# arXiv categories a paper needs at least one of to be kept; the filter is applied
+# server-side by ANDing every query with RELEVANT_CATEGORIES_QUERY
+RELEVANT_CATEGORIES = ('cs.AI', 'cs.LG', 'cs.CV', 'cs.CL', 'cs.NE', 'stat.ML')
+RELEVANT_CATEGORIES_QUERY = '(' + ' OR '.join(f'cat:{category}' for category in RELEVANT_CATEGORIES) + ')'
+
+# Category relevance: +10 per high-value category, +5 per medium-value one
+HIGH_VALUE_CATEGORIES = frozenset({'cs.AI', 'cs.LG', 'cs.CV', 'cs.CL'})
+MEDIUM_VALUE_CATEGORIES = frozenset({'cs.NE', 'stat.ML', 'cs.IR'})
+CATEGORY_SCORES = MappingProxyType({
+    **{category: 5 for category in MEDIUM_VALUE_CATEGORIES},
+    **{category: 10 for category in HIGH_VALUE_CATEGORIES},
+})
+
+# arXiv category -> blog category; the first mapped category of a paper wins and
+# anything unmapped becomes 'basic-concepts'
+CATEGORY_MAPPING = MappingProxyType({
+    'cs.LG': 'foundation-models',  # Machine Learning
+    'cs.CL': 'foundation-models',  # Computation and Language
+    'cs.CV': 'basic-concepts',     # Computer Vision
+    'cs.AI': 'foundation-models',  # Artificial Intelligence
+    'cs.NE': 'basic-concepts',     # Neural and Evolutionary Computing
+    'stat.ML': 'foundation-models', # Machine Learning (Statistics)
+    'cs.RO': 'ai-applications',    # Robotics
+    'cs.HC': 'ai-applications',    # Human-Computer Interaction
+    'q-bio': 'ai-applications',    # Quantitative Biology
+})
+MAPPED_CATEGORIES = frozenset(CATEGORY_MAPPING)
+
+# Keywords that make a paper more relevant: +3 when in the title, else +1 when in the abstract
+IMPORTANT_KEYWORDS = (
+    'transformer', 'attention', 'neural network', 'deep learning',
+    'machine learning', 'artificial intelligence', 'generative',
+    'classification', 'detection', 'segmentation', 'language model',
+    'computer vision', 'natural language processing', 'reinforcement learning',
+    'diffusion', 'llm', 'large language model', 'multimodal', 'vision transformer'
+)
+
+# Upper bound of the keyword part of the relevance score (every keyword in the title)
+MAX_KEYWORD_SCORE = 3 * len(IMPORTANT_KEYWORDS)
+
+# One automaton finds every keyword in a single pass. Without pyahocorasick, a
+# precompiled case-insensitive lookahead alternation does the same overlapping
+# scan in the regex engine, without lowercasing a copy of the text first.
+if ahocorasick is not None:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in IMPORTANT_KEYWORDS:
+        KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    KEYWORD_AUTOMATON.make_automaton()
+    KEYWORD_PATTERN = None
+else:
+    KEYWORD_AUTOMATON = None
+    KEYWORD_PATTERN = re.compile(
+        '(?=(' + '|'.join(map(re.escape, sorted(IMPORTANT_KEYWORDS, key=len, reverse=True))) + '))',
+        re.IGNORECASE | re.ASCII
+    )
+
+def _match_keywords(text: str) -> set:
+    """Return the set of IMPORTANT_KEYWORDS occurring in text, ignoring case."""
+    if KEYWORD_AUTOMATON is not None:
+        return {keyword for _, keyword in KEYWORD_AUTOMATON.iter(text.lower())}
+    return {match.lower() for match in KEYWORD_PATTERN.findall(text)}
+
+@functools.lru_cache(maxsize=1024)
+def _map_categories(arxiv_categories: tuple) -> str:
+    """Blog category for a tuple of arXiv categories; papers share a few combinations, so this is cached."""
+    if MAPPED_CATEGORIES.isdisjoint(arxiv_categories):
+        return 'basic-concepts'
+    return next(CATEGORY_MAPPING[cat] for cat in arxiv_categories if cat in CATEGORY_MAPPING)
+
+def _query_terms(query: str) -> Optional[frozenset]:
+    """
+    Return the lowercased OR-terms of a plain disjunctive query, e.g.
+    "(transformer OR attention)" -> {"transformer", "attention"}.
+    
+    Returns None for anything else (AND/ANDNOT, nested groups, field prefixes),
+    whose result set can't be compared by terms alone.
+    """
+    body = query.strip()
+    if body.startswith('(') and body.endswith(')'):
+        body = body[1:-1]
+    if re.search(r'[()":]|\bAND(?:NOT)?\b', body):
+        return None
+    terms = frozenset(' '.join(term.split()).lower() for term in re.split(r'\s+OR\s+', body))
+    return None if '' in terms else terms
+
+def _drop_redundant_queries(queries: List[str]) -> List[str]:
+    """
+    Drop queries whose OR-terms are identical to an earlier query's.
+    
+    Each query only returns its top max_results papers, so a narrower query is
+    not covered by a broader one and is kept; only exact repeats are dropped.
+    """
+    seen = set()
+    kept = []
+    for query in queries:
+        terms = _query_terms(query)
+        if terms is not None and terms in seen:
+            continue
+        if terms is not None:
+            seen.add(terms)
+        kept.append(query)
+    return kept
+
+# Landmark papers used for the initial blog content. Kept as JSON text and only
+# parsed the first time get_classic_papers is called.
+CLASSIC_PAPERS_JSON = r'''[
+    {
+        "id": "1706.03762",
+        "title": "Attention Is All You Need",
+        "authors": ["Ashish Vaswani", "Noam Shazeer", "Niki Parmar", "Jakob Uszkoreit", "Llion Jones", "Aidan N. Gomez", "Lukasz Kaiser", "Illia Polosukhin"],
+        "abstract": "The dominant sequence transduction models are based on complex recurrent or convolutional neural networks that include an encoder and a decoder. The best performing models also connect the encoder and decoder through an attention mechanism. We propose a new simple network architecture, the Transformer, based solely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
+        "published": "2017-06-12",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1706.03762"
+    },
+    {
+        "id": "1207.0580",
+        "title": "ImageNet Classification with Deep Convolutional Neural Networks",
+        "authors": ["Alex Krizhevsky", "Ilya Sutskever", "Geoffrey E. Hinton"],
+        "abstract": "We trained a large, deep convolutional neural network to classify the 1.2 million high-resolution images in the ImageNet LSVRC-2010 contest into the 1000 different classes. On the test data, we achieved top-1 and top-5 error rates of 37.5% and 17.0% which is considerably better than the previous state-of-the-art.",
+        "published": "2012-07-03",
+        "category": "basic-concepts",
+        "url": "https://arxiv.org/abs/1207.0580"
+    },
+    {
+        "id": "1406.2661",
+        "title": "Generative Adversarial Networks",
+        "authors": ["Ian J. Goodfellow", "Jean Pouget-Abadie", "Mehdi Mirza", "Bing Xu", "David Warde-Farley", "Sherjil Ozair", "Aaron Courville", "Yoshua Bengio"],
+        "abstract": "We propose a new framework for estimating generative models via an adversarial process, in which we simultaneously train two models: a generative model G that captures the data distribution, and a discriminative model D that estimates the probability that a sample came from the training data rather than G.",
+        "published": "2014-06-10",
+        "category": "generative-models",
+        "url": "https://arxiv.org/abs/1406.2661"
+    },
+    {
+        "id": "1810.04805",
+        "title": "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
+        "authors": ["Jacob Devlin", "Ming-Wei Chang", "Kenton Lee", "Kristina Toutanova"],
+        "abstract": "We introduce a new language representation model called BERT, which stands for Bidirectional Encoder Representations from Transformers. Unlike recent language representation models, BERT is designed to pre-train deep bidirectional representations from unlabeled text by jointly conditioning on both left and right context in all layers.",
+        "published": "2018-10-11",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1810.04805"
+    },
+    {
+        "id": "1909.11942",
+        "title": "Language Models are Unsupervised Multitask Learners",
+        "authors": ["Alec Radford", "Jeffrey Wu", "Rewon Child", "David Luan", "Dario Amodei", "Ilya Sutskever"],
+        "abstract": "Natural language processing tasks, such as question answering, machine translation, reading comprehension, and summarization, are typically approached with supervised learning on taskspecific datasets. We demonstrate that language models begin to learn these tasks without any explicit supervision when trained on a new dataset of millions of webpages called WebText.",
+        "published": "2019-02-14",
+        "category": "foundation-models",
+        "url": "https://arxiv.org/abs/1909.11942"
+    }
+]'''
+
+@functools.cache
+def _classic_papers() -> tuple:
+    """Parse CLASSIC_PAPERS_JSON once; callers get copies via get_classic_papers."""
+    papers = orjson.loads(CLASSIC_PAPERS_JSON)
+    return tuple(papers)
+
+class FeedCache:
+    """
+    On-disk cache of arXiv Atom responses keyed by query string.
+    
+    Stores the body together with its ETag and Last-Modified headers so stale
+    entries can be revalidated with a conditional GET.
+    """
+    
+    def __init__(self, path: str = "generated_content/cache/arxiv_feeds.sqlite", ttl: int = FEED_CACHE_TTL):
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feeds ("
+            "key TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT, fetched REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        return urlencode(sorted(params.items()))
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (body, etag, last_modified, fetched) for key, or None."""
+        return self._conn.execute(
+            "SELECT body, etag, last_modified, fetched FROM feeds WHERE key = ?", (key,)
+        ).fetchone()
+    
+    def set(self, key: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        self._conn.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)",
+                           (key, body, etag, last_modified, time.time()))
+        self._conn.commit()
+    
+    def touch(self, key: str):
+        self._conn.execute("UPDATE feeds SET fetched = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+    
+    def close(self):
+        self._conn.close()
+
+class ArxivEntry(NamedTuple):
+    """One entry of an arXiv Atom feed, with the fields the fetcher reads."""
+    entry_id: str
+    title: str
+    authors: List[str]
+    summary: str
+    published: datetime
+    published_ts: int
+    updated: Optional[datetime]
+    categories: List[str]
+    pdf_url: Optional[str]
 
 class EnhancedArxivFetcher:
     def __init__(self):
         self.base_url = "http://export.arxiv.org/api/query"
-        self.classic_papers = [
-            {
-                "id": "1706.03762",
-                "title": "Attention Is All You Need",
-                "authors": ["Ashish Vaswani", "Noam Shazeer", "Niki Parmar", "Jakob Uszkoreit", "Llion Jones", "Aidan N. Gomez", "Lukasz Kaiser", "Illia Polosukhin"],
-                "abstract": "The dominant sequence transduction models are based on complex recurrent or convolutional neural networks that include an encoder and a decoder. The best performing models also connect the encoder and decoder through an attention mechanism. We propose a new simple network architecture, the Transformer, based solely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
-                "published": "2017-06-12",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1706.03762"
-            },
-            {
-                "id": "1207.0580",
-                "title": "ImageNet Classification with Deep Convolutional Neural Networks",
-                "authors": ["Alex Krizhevsky", "Ilya Sutskever", "Geoffrey E. Hinton"],
-                "abstract": "We trained a large, deep convolutional neural network to classify the 1.2 million high-resolution images in the ImageNet LSVRC-2010 contest into the 1000 different classes. On the test data, we achieved top-1 and top-5 error rates of 37.5% and 17.0% which is considerably better than the previous state-of-the-art.",
-                "published": "2012-07-03",
-                "category": "basic-concepts",
-                "url": "https://arxiv.org/abs/1207.0580"
-            },
-            {
-                "id": "1406.2661",
-                "title": "Generative Adversarial Networks",
-                "authors": ["Ian J. Goodfellow", "Jean Pouget-Abadie", "Mehdi Mirza", "Bing Xu", "David Warde-Farley", "Sherjil Ozair", "Aaron Courville", "Yoshua Bengio"],
-                "abstract": "We propose a new framework for estimating generative models via an adversarial process, in which we simultaneously train two models: a generative model G that captures the data distribution, and a discriminative model D that estimates the probability that a sample came from the training data rather than G.",
-                "published": "2014-06-10",
-                "category": "generative-models",
-                "url": "https://arxiv.org/abs/1406.2661"
-            },
-            {
-                "id": "1810.04805",
-                "title": "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
-                "authors": ["Jacob Devlin", "Ming-Wei Chang", "Kenton Lee", "Kristina Toutanova"],
-                "abstract": "We introduce a new language representation model called BERT, which stands for Bidirectional Encoder Representations from Transformers. Unlike recent language representation models, BERT is designed to pre-train deep bidirectional representations from unlabeled text by jointly conditioning on both left and right context in all layers.",
-                "published": "2018-10-11",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1810.04805"
-            },
-            {
-                "id": "1909.11942",
-                "title": "Language Models are Unsupervised Multitask Learners",
-                "authors": ["Alec Radford", "Jeffrey Wu", "Rewon Child", "David Luan", "Dario Amodei", "Ilya Sutskever"],
-                "abstract": "Natural language processing tasks, such as question answering, machine translation, reading comprehension, and summarization, are typically approached with supervised learning on taskspecific datasets. We demonstrate that language models begin to learn these tasks without any explicit supervision when trained on a new dataset of millions of webpages called WebText.",
-                "published": "2019-02-14",
-                "category": "foundation-models",
-                "url": "https://arxiv.org/abs/1909.11942"
-            }
-        ]
+        self.feed_cache = FeedCache()
+    
+    def close(self):
+        """Close the feed cache."""
+        self.feed_cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def get_classic_papers(self) -> List[Dict]:
         """Get the list of classic papers for initial blog content."""
-        return self.classic_papers
+        return [{**paper, "authors": list(paper["authors"])} for paper in _classic_papers()]
     
     def search_recent_papers(self, query="machine learning", max_results=10, days_back=7):
         """
@@ -81,109 +297,231 @@ class EnhancedArxivFetcher:
             list: List of paper dictionaries
         """
         # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
+        now_ts = int(time.time())
+        start_ts = now_ts - days_back * 86400
         
         # Enhanced search queries for AI/ML papers
-        ai_ml_queries = [
+        ai_ml_queries = _drop_redundant_queries([
             f"({query})",
             "(artificial intelligence OR machine learning OR deep learning OR neural network OR transformer OR attention mechanism)",
             "(computer vision OR natural language processing OR reinforcement learning OR generative model)"
-        ]
+        ])
         
-        all_papers = []
+        per_query = max_results // len(ai_ml_queries) + 5  # Get more to filter later
+        feeds = asyncio.run(self._search_all([
+            self._query_params(f"{search_query} AND {RELEVANT_CATEGORIES_QUERY}", per_query, 'submittedDate')
+            for search_query in ai_ml_queries
+        ]))
         
-        for search_query in ai_ml_queries:
-            try:
-                search = arxiv.Search(
-                    query=search_query,
-                    max_results=max_results // len(ai_ml_queries) + 5,  # Get more to filter later
-                    sort_by=arxiv.SortCriterion.SubmittedDate,
-                    sort_order=arxiv.SortOrder.Descending
-                )
+        # Score and select in one pass with a min-heap of the best max_results papers.
+        # Entries are (score, -seq, result) so that, among equal scores, the paper
+        # seen first ranks higher. A paper whose cheap base score cannot beat the
+        # heap minimum even with every keyword skips the keyword scan entirely.
+        # The same paper scores identically in every query, so repeats are skipped.
+        if max_results <= 0:
+            return []
+        
+        heap = []
+        seen_ids = set()
+        seq = 0
+        for entries in feeds:
+            for result in entries:
+                # Only recent papers; arXiv already restricted the categories
+                if result.published_ts < start_ts or result.entry_id in seen_ids:
+                    continue
+                seen_ids.add(result.entry_id)
                 
-                for result in search.results():
-                    # Filter for relevant categories and recent papers
-                    relevant_categories = ['cs.AI', 'cs.LG', 'cs.CV', 'cs.CL', 'cs.NE', 'stat.ML']
-                    paper_date = result.published.replace(tzinfo=None)
-                    
-                    if (any(cat in result.categories for cat in relevant_categories) and 
-                        paper_date >= start_date):
-                        
-                        paper_data = {
-                            'id': result.entry_id.split('/')[-1],
-                            'title': result.title,
-                            'authors': [str(author) for author in result.authors],
-                            'summary': result.summary,
-                            'published': result.published.isoformat(),
-                            'updated': result.updated.isoformat() if result.updated else None,
-                            'categories': result.categories,
-                            'pdf_url': result.pdf_url,
-                            'entry_id': result.entry_id,
-                            'relevance_score': self._calculate_relevance_score(result),
-                            'category': self._map_category(result.categories)
-                        }
-                        all_papers.append(paper_data)
-                        
-            except Exception as e:
-                print(f"Error searching with query '{search_query}': {e}")
-                continue
+                base = self._base_score(result, now_ts)
+                if len(heap) == max_results and base + MAX_KEYWORD_SCORE <= heap[0][0]:
+                    continue
+                
+                item = (base + self._keyword_score(result), -seq, result)
+                seq += 1
+                if len(heap) < max_results:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
         
-        # Remove duplicates and sort by relevance score
-        unique_papers = {}
-        for paper in all_papers:
-            if paper['id'] not in unique_papers:
-                unique_papers[paper['id']] = paper
+        # Highest relevance score first
+        return [self._paper_from_result(result, score) for score, _, result in sorted(heap, reverse=True)]
+    
+    def _query_params(self, search_query: str, max_results: int, sort_by: str) -> Dict:
+        """Build the arXiv API query parameters."""
+        return {
+            'search_query': search_query,
+            'start': 0,
+            'max_results': max_results,
+            'sortBy': sort_by,
+            'sortOrder': 'descending'
+        }
+    
+    async def _fetch_atom(self, session: aiohttp.ClientSession, params: Dict) -> str:
+        """
+        Fetch one Atom feed from the arXiv API, going through the feed cache
+        
+        A fresh cached feed is returned as is; a stale one is revalidated with
+        If-None-Match/If-Modified-Since and reused on 304 Not Modified. Transient
+        failures are retried up to NUM_RETRIES times, waiting out a short
+        Retry-After when arXiv sends one; if they still fail, a stale cached
+        feed is served rather than nothing.
+        """
+        key = self.feed_cache.make_key(params)
+        cached = self.feed_cache.get(key)
+        if cached and time.time() - cached[3] < self.feed_cache.ttl:
+            return cached[0]
         
-        # Sort by relevance score (higher is better)
-        sorted_papers = sorted(unique_papers.values(), 
-                             key=lambda x: x.get('relevance_score', 0), 
-                             reverse=True)
+        headers = {}
+        if cached:
+            if cached[1]:
+                headers['If-None-Match'] = cached[1]
+            if cached[2]:
+                headers['If-Modified-Since'] = cached[2]
         
-        return sorted_papers[:max_results]
+        try:
+            for attempt in range(NUM_RETRIES + 1):
+                last_attempt = attempt == NUM_RETRIES
+                delay = RETRY_DELAY * 2 ** attempt
+                try:
+                    async with session.get(self.base_url, params=params, headers=headers) as response:
+                        if response.status == 304 and cached:
+                            self.feed_cache.touch(key)
+                            return cached[0]
+                        
+                        if response.status not in RETRY_STATUSES or last_attempt:
+                            response.raise_for_status()
+                            body = await response.text()
+                            self.feed_cache.set(key, body, response.headers.get('ETag'),
+                                                response.headers.get('Last-Modified'))
+                            return body
+                    
+                    # Retryable status: honour a short Retry-After, give up on a long one
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        if int(retry_after) > MAX_RETRY_AFTER:
+                            response.raise_for_status()
+                        delay = int(retry_after)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if last_attempt:
+                        raise
+                
+                await asyncio.sleep(delay)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Revalidation failed for good; an old feed beats no feed
+            if not cached:
+                raise
+            print(f"Error fetching feed, using cached copy: {e}")
+            return cached[0]
     
-    def _calculate_relevance_score(self, result):
+    async def _search_all(self, params_list: List[Dict]) -> List[List[ArxivEntry]]:
         """
-        Calculate a relevance score for a paper based on various factors
+        Run several arXiv queries concurrently over one keep-alive session
         
         Args:
-            result: arXiv search result object
+            params_list (list): Query parameter dicts, one per request
             
         Returns:
-            float: Relevance score (higher is better)
+            list: Parsed entries for each query, in the order given
         """
-        score = 0
-        
-        # Category relevance (AI/ML categories get higher scores)
-        high_value_categories = ['cs.AI', 'cs.LG', 'cs.CV', 'cs.CL']
-        medium_value_categories = ['cs.NE', 'stat.ML', 'cs.IR']
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT) as session:
+            feeds = await asyncio.gather(
+                *[self._fetch_atom(session, params) for params in params_list],
+                return_exceptions=True
+            )
         
-        for category in result.categories:
-            if category in high_value_categories:
-                score += 10
-            elif category in medium_value_categories:
-                score += 5
+        results = []
+        for params, feed in zip(params_list, feeds):
+            if isinstance(feed, BaseException):
+                print(f"Error searching with query '{params['search_query']}': {feed}")
+                results.append([])
+                continue
+            # Keep one bad feed from failing the other queries
+            try:
+                results.append(self._parse_atom(feed))
+            except Exception as e:
+                print(f"Error parsing results for query '{params['search_query']}': {e}")
+                results.append([])
         
-        # Title and abstract keyword relevance
-        important_keywords = [
-            'transformer', 'attention', 'neural network', 'deep learning',
-            'machine learning', 'artificial intelligence', 'generative',
-            'classification', 'detection', 'segmentation', 'language model',
-            'computer vision', 'natural language processing', 'reinforcement learning',
-            'diffusion', 'llm', 'large language model', 'multimodal', 'vision transformer'
-        ]
+        return results
+    
+    def _parse_atom(self, feed: str) -> List[ArxivEntry]:
+        """Stream-parse an arXiv Atom feed, dropping each <entry> element once it is read."""
+        entries = []
+        root = None
+        for event, elem in ET.iterparse(io.BytesIO(feed.encode('utf-8')), events=('start', 'end')):
+            if root is None:
+                root = elem
+            elif event == 'end' and elem.tag == ATOM_ENTRY:
+                # arXiv reports query errors as an entry without a <published> date
+                try:
+                    entries.append(self._parse_entry(elem))
+                except (ValueError, TypeError) as e:
+                    print(f"Skipping unparseable entry {elem.findtext(ATOM_ID, '')}: {e}")
+                root.remove(elem)
         
-        title_lower = result.title.lower()
-        summary_lower = result.summary.lower()
+        return entries
+    
+    def _parse_entry(self, entry) -> ArxivEntry:
+        """Parse a single Atom <entry> element."""
+        published = datetime.fromisoformat(entry.findtext(ATOM_PUBLISHED))
+        updated = entry.findtext(ATOM_UPDATED)
+        pdf_url = next((link.get('href') for link in entry.iterfind(ATOM_LINK)
+                        if link.get('title') == 'pdf'), None)
+        return ArxivEntry(
+            entry_id=entry.findtext(ATOM_ID, ''),
+            title=re.sub(r'\s+', ' ', entry.findtext(ATOM_TITLE, '')).strip(),
+            authors=[author.findtext(ATOM_NAME, '') for author in entry.iterfind(ATOM_AUTHOR)],
+            summary=entry.findtext(ATOM_SUMMARY, '').strip(),
+            published=published,
+            published_ts=int(published.timestamp()),
+            updated=datetime.fromisoformat(updated) if updated else None,
+            categories=[category.get('term') for category in entry.iterfind(ATOM_CATEGORY)],
+            pdf_url=pdf_url
+        )
+    
+    def _paper_from_result(self, result, relevance_score: int) -> Dict:
+        """Convert a parsed arXiv entry into a paper dictionary."""
+        return {
+            'id': result.entry_id.split('/')[-1],
+            'title': result.title,
+            'authors': [str(author) for author in result.authors],
+            'summary': result.summary,
+            'published': result.published.isoformat(),
+            'published_ts': result.published_ts,
+            'updated': result.updated.isoformat() if result.updated else None,
+            'categories': result.categories,
+            'pdf_url': result.pdf_url,
+            'entry_id': result.entry_id,
+            'relevance_score': relevance_score,
+            'category': self._map_category(result.categories)
+        }
+    
+    def _calculate_relevance_score(self, result, now_ts: int):
+        """
+        Calculate a relevance score for a paper based on various factors
         
-        for keyword in important_keywords:
-            if keyword in title_lower:
-                score += 3
-            elif keyword in summary_lower:
-                score += 1
+        Args:
+            result: Parsed arXiv entry
+            now_ts (int): Reference epoch seconds for the recency bonus, shared by the whole batch
+            
+        Returns:
+            float: Relevance score (higher is better)
+        """
+        return self._base_score(result, now_ts) + self._keyword_score(result)
+    
+    def _keyword_score(self, result) -> int:
+        """Title and abstract keyword relevance; at most MAX_KEYWORD_SCORE."""
+        title_matches = _match_keywords(result.title)
+        summary_matches = _match_keywords(result.summary) - title_matches
+        return 3 * len(title_matches) + len(summary_matches)
+    
+    def _base_score(self, result, now_ts: int) -> int:
+        """The cheap part of the relevance score: categories, recency and abstract length."""
+        # Category relevance (AI/ML categories get higher scores)
+        score = sum(map(CATEGORY_SCORES.get, result.categories, repeat(0)))
         
         # Recency bonus (more recent papers get slightly higher scores)
-        days_old = (datetime.now() - result.published.replace(tzinfo=None)).days
+        days_old = (now_ts - result.published_ts) // 86400
         if days_old <= 1:
             score += 5
         elif days_old <= 7:
@@ -201,24 +539,7 @@ class EnhancedArxivFetcher:
     
     def _map_category(self, arxiv_categories: List[str]) -> str:
         """Map arXiv categories to blog categories."""
-        category_mapping = {
-            'cs.LG': 'foundation-models',  # Machine Learning
-            'cs.CL': 'foundation-models',  # Computation and Language
-            'cs.CV': 'basic-concepts',     # Computer Vision
-            'cs.AI': 'foundation-models',  # Artificial Intelligence
-            'cs.NE': 'basic-concepts',     # Neural and Evolutionary Computing
-            'stat.ML': 'foundation-models', # Machine Learning (Statistics)
-            'cs.RO': 'ai-applications',    # Robotics
-            'cs.HC': 'ai-applications',    # Human-Computer Interaction
-            'q-bio': 'ai-applications',    # Quantitative Biology
-        }
-        
-        for cat in arxiv_categories:
-            if cat in category_mapping:
-                return category_mapping[cat]
-        
-        # Default category
-        return 'basic-concepts'
+        return _map_categories(tuple(arxiv_categories))
     
     def search_papers_by_topic(self, topic: str, max_results: int = 5) -> List[Dict]:
         """
@@ -231,42 +552,34 @@ class EnhancedArxivFetcher:
         Returns:
             list: List of paper dictionaries
         """
-        try:
-            search = arxiv.Search(
-                query=topic,
-                max_results=max_results * 2,  # Get more to filter
-                sort_by=arxiv.SortCriterion.Relevance,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
-            papers = []
-            for result in search.results():
-                # Filter for relevant categories
-                relevant_categories = ['cs.AI', 'cs.LG', 'cs.CV', 'cs.CL', 'cs.NE', 'stat.ML']
-                if any(cat in result.categories for cat in relevant_categories):
-                    paper_data = {
-                        'id': result.entry_id.split('/')[-1],
-                        'title': result.title,
-                        'authors': [str(author) for author in result.authors],
-                        'summary': result.summary,
-                        'published': result.published.isoformat(),
-                        'updated': result.updated.isoformat() if result.updated else None,
-                        'categories': result.categories,
-                        'pdf_url': result.pdf_url,
-                        'entry_id': result.entry_id,
-                        'relevance_score': self._calculate_relevance_score(result),
-                        'category': self._map_category(result.categories)
-                    }
-                    papers.append(paper_data)
-                    
-                    if len(papers) >= max_results:
-                        break
-            
-            return papers
+        return self.search_papers_by_topics([topic], max_results)[topic]
+    
+    def search_papers_by_topics(self, topics: List[str], max_results: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Search for papers on several topics, issuing the queries concurrently
+        
+        Args:
+            topics (list): Topics to search for
+            max_results (int): Maximum number of results per topic
             
-        except Exception as e:
-            print(f"Error searching papers by topic '{topic}': {e}")
-            return []
+        Returns:
+            dict: Topic -> list of paper dictionaries
+        """
+        feeds = asyncio.run(self._search_all([
+            self._query_params(f"({topic}) AND {RELEVANT_CATEGORIES_QUERY}", max_results, 'relevance')
+            for topic in topics
+        ]))
+        
+        now_ts = int(time.time())
+        papers_by_topic = {}
+        for topic, entries in zip(topics, feeds):
+            # arXiv already restricted the categories, so every entry is kept
+            papers_by_topic[topic] = [
+                self._paper_from_result(result, self._calculate_relevance_score(result, now_ts))
+                for result in entries[:max_results]
+            ]
+        
+        return papers_by_topic
     
     def get_trending_topics(self) -> List[str]:
         """
@@ -295,33 +608,34 @@ class EnhancedArxivFetcher:
     
     def save_papers_to_json(self, papers: List[Dict], filename: str):
         """Save papers to JSON file."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, indent=2, ensure_ascii=False)
+        data = orjson.dumps(papers, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with open(filename, 'wb') as f:
+            f.write(data)
         print(f"Saved {len(papers)} papers to {filename}")
 
 def main():
     """Example usage of EnhancedArxivFetcher."""
-    fetcher = EnhancedArxivFetcher()
-    
-    # Get recent papers
-    print("Getting recent papers...")
-    recent_papers = fetcher.search_recent_papers(
-        query="transformer OR attention mechanism", 
-        max_results=5, 
-        days_back=30
-    )
-    fetcher.save_papers_to_json(recent_papers, 'recent_papers.json')
-    
-    # Search by trending topics
-    print("Searching by trending topics...")
-    trending_topics = fetcher.get_trending_topics()
-    for topic in trending_topics[:3]:  # Test first 3 topics
-        print(f"Searching for: {topic}")
-        papers = fetcher.search_papers_by_topic(topic, max_results=2)
-        if papers:
-            print(f"Found {len(papers)} papers for {topic}")
-    
-    print("Done!")
+    with EnhancedArxivFetcher() as fetcher:
+        # Get recent papers
+        print("Getting recent papers...")
+        recent_papers = fetcher.search_recent_papers(
+            query="transformer OR attention mechanism", 
+            max_results=5, 
+            days_back=30
+        )
+        fetcher.save_papers_to_json(recent_papers, 'recent_papers.json')
+        
+        # Search by trending topics
+        print("Searching by trending topics...")
+        trending_topics = fetcher.get_trending_topics()[:3]  # Test first 3 topics
+        for topic in trending_topics:
+            print(f"Searching for: {topic}")
+        papers_by_topic = fetcher.search_papers_by_topics(trending_topics, max_results=2)
+        for topic, papers in papers_by_topic.items():
+            if papers:
+                print(f"Found {len(papers)} papers for {topic}")
+        
+        print("Done!")
 
 if __name__ == "__main__":
     main()
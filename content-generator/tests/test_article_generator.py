@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+import article_generator
+from article_generator import CachedArticleGenerator, ResponseCache, is_error_article
+
+
+def _article(**overrides):
+    article = {
+        "title": "Paper Explained: Example - A Beginner's Guide",
+        "subtitle": "Subtitle",
+        "paper_url": "https://arxiv.org/abs/2401.00001v1",
+        "concept_explained": "Concept",
+        "content": {"background": "b", "methodology": "m", "results": "r", "significance": "s"},
+        "concept_explanation": {"title": "t", "content": "c"},
+        "summary": "Summary",
+    }
+    article.update(overrides)
+    return article
+
+
+def test_is_error_article_accepts_clean_article():
+    assert not is_error_article(_article())
+
+
+@pytest.mark.parametrize("overrides", [
+    {"subtitle": "Error generating content: timeout"},
+    {"summary": "Error generating content: timeout"},
+    {"concept_explained": "Error generating content: timeout"},
+    {"concept_explanation": {"title": "t", "content": "Error generating content: timeout"}},
+    {"content": {"background": "b", "methodology": "Error generating content: timeout",
+                 "results": "r", "significance": "s"}},
+])
+def test_is_error_article_detects_error_sections(overrides):
+    assert is_error_article(_article(**overrides))
+
+
+def test_is_error_article_ignores_error_text_mid_section():
+    assert not is_error_article(_article(summary="We discuss Error generating content: in prompts."))
+
+
+class FakeGenerator:
+    """Stands in for ArticleGenerator; embeds every paper to the same vector."""
+
+    def __init__(self, article=None):
+        self.article = article
+        self.generated = []
+        self.embedded = []
+
+    async def embed_text(self, text):
+        self.embedded.append(text)
+        return [1.0, 0.0, 0.0]
+
+    async def generate_article(self, paper):
+        self.generated.append(paper["id"])
+        return self.article or _article(paper_url=f"https://arxiv.org/abs/{paper['id']}")
+
+
+def _paper(paper_id, title="Example"):
+    return {"id": paper_id, "title": title, "summary": "Abstract"}
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_article_cache_hits_exact_paper(cache_dir):
+    generator = FakeGenerator()
+    cache = CachedArticleGenerator(generator, cache_dir, threshold=None)
+    try:
+        first = asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+        second = asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+    finally:
+        cache.close()
+
+    assert second == first
+    assert generator.generated == ["2401.00001v1"]
+
+
+def test_article_cache_entries_expire_after_ttl(cache_dir, monkeypatch):
+    generator = FakeGenerator()
+    cache = CachedArticleGenerator(generator, cache_dir, threshold=None, ttl=60)
+    try:
+        now = 1_000_000.0
+        monkeypatch.setattr(article_generator.time, "time", lambda: now)
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+        now += 61
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+    finally:
+        cache.close()
+
+    assert generator.generated == ["2401.00001v1", "2401.00001v1"]
+
+
+def test_article_cache_reuses_other_version_of_same_paper(cache_dir):
+    generator = FakeGenerator()
+    cache = CachedArticleGenerator(generator, cache_dir, threshold=0.9)
+    try:
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+        assert generator.embedded == []
+
+        article = asyncio.run(cache.generate_article(_paper("2401.00001v2", title="Example, revised")))
+    finally:
+        cache.close()
+
+    assert generator.generated == ["2401.00001v1"]
+    assert article["paper_url"] == "https://arxiv.org/abs/2401.00001v2"
+    assert len(generator.embedded) == 2
+
+
+def test_article_cache_never_reuses_across_papers(cache_dir):
+    generator = FakeGenerator()
+    cache = CachedArticleGenerator(generator, cache_dir, threshold=0.0)
+    try:
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+        asyncio.run(cache.generate_article(_paper("2401.00002v1")))
+    finally:
+        cache.close()
+
+    assert generator.generated == ["2401.00001v1", "2401.00002v1"]
+    assert generator.embedded == []
+
+
+def test_article_cache_skips_error_articles(cache_dir):
+    generator = FakeGenerator(_article(summary="Error generating content: rate limited"))
+    cache = CachedArticleGenerator(generator, cache_dir, threshold=None)
+    try:
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+        asyncio.run(cache.generate_article(_paper("2401.00001v1")))
+    finally:
+        cache.close()
+
+    assert generator.generated == ["2401.00001v1", "2401.00001v1"]
+
+
+def test_response_cache_exact_and_semantic_lookup(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path, semantic_threshold=0.95)
+    key = ResponseCache.make_key([{"role": "user", "content": "hello"}])
+    cache.set(key, "cached response", [1.0, 0.0])
+    cache.close()
+
+    reopened = ResponseCache(path, semantic_threshold=0.95)
+    try:
+        assert reopened.get(key) == "cached response"
+        assert reopened.get(ResponseCache.make_key([{"role": "user", "content": "other"}])) is None
+        assert reopened.nearest([0.99, 0.05]) == "cached response"
+        assert reopened.nearest([0.0, 1.0]) is None
+    finally:
+        reopened.close()
@@ -0,0 +1,80 @@
+import os
+
+import orjson
+import pytest
+
+import content_manager
+from content_manager import _atomic_write, _write_if_changed, dumps_json, load_json
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "articles.json"
+    path.write_bytes(b"old")
+
+    _atomic_write(str(path), b"new contents")
+
+    assert path.read_bytes() == b"new contents"
+    assert os.listdir(tmp_path) == ["articles.json"]
+
+
+def test_atomic_write_keeps_original_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "articles.json"
+    path.write_bytes(b"published data")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(content_manager.os, "replace", fail)
+
+    with pytest.raises(OSError):
+        _atomic_write(str(path), b"partial")
+
+    assert path.read_bytes() == b"published data"
+    assert os.listdir(tmp_path) == ["articles.json"]
+
+
+def test_write_if_changed_skips_identical_content(tmp_path):
+    path = tmp_path / "HomePage.jsx"
+
+    assert _write_if_changed(str(path), "export default 1;\n")
+    mtime = path.stat().st_mtime_ns
+    assert not _write_if_changed(str(path), "export default 1;\n")
+    assert path.stat().st_mtime_ns == mtime
+    assert _write_if_changed(str(path), "export default 2;\n")
+    assert path.read_text() == "export default 2;\n"
+
+
+@pytest.mark.parametrize("size", [10, content_manager.MMAP_MIN_SIZE * 2])
+def test_load_json_round_trips(tmp_path, size):
+    data = {"text": "x" * size, "items": [1, 2, 3]}
+    path = tmp_path / "data.json"
+    path.write_bytes(dumps_json(data, pretty=True))
+
+    assert load_json(str(path)) == data
+
+
+def test_integrate_articles_writes_and_returns_article_data(tmp_path):
+    (tmp_path / "src" / "components").mkdir(parents=True)
+    manager = content_manager.ContentManager(str(tmp_path))
+    article = {
+        "title": "Paper Explained: Attention Is All You Need - A Beginner's Guide",
+        "subtitle": "Subtitle",
+        "category": "Foundation Models",
+        "authors": ["Ashish Vaswani"],
+        "paper_url": "https://arxiv.org/abs/1706.03762",
+        "read_time": "5 min read",
+        "publish_date": "2024-01-01",
+        "concept_explained": "Attention",
+        "content": {"background": "First. Second. Third.", "methodology": "m", "results": "r",
+                    "significance": "s"},
+        "concept_explanation": {"title": "t", "content": "c"},
+        "summary": "Summary",
+    }
+
+    articles_data = manager.integrate_articles([article])
+
+    written = orjson.loads((tmp_path / "src" / "data" / "articles.json").read_bytes())
+    assert written == articles_data
+    assert articles_data[0]["id"] == "attention-is-all-you-need"
+    assert articles_data[0]["categorySlug"] == "foundation-models"
+    assert articles_data[0]["excerpt"] == "First. Second."
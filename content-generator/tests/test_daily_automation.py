@@ -0,0 +1,59 @@
+from daily_automation import ArticleIndex, IdBloomFilter
+
+
+def test_bloom_filter_persists_ids_and_source_mtime(tmp_path):
+    path = str(tmp_path / "ids.bloom")
+    bloom = IdBloomFilter(path, capacity=1000)
+    bloom.rebuild(["2401.00001", "2401.00002"], 111)
+    bloom.add("2401.00003")
+    bloom.mark_synced(222)
+    bloom.close()
+
+    reopened = IdBloomFilter(path, capacity=1000)
+    try:
+        assert reopened.source_mtime() == 222
+        assert all(paper_id in reopened for paper_id in ("2401.00001", "2401.00002", "2401.00003"))
+        misses = [f"2402.{i:05d}" for i in range(1000)]
+        assert sum(paper_id in reopened for paper_id in misses) <= 5
+    finally:
+        reopened.close()
+
+
+def test_bloom_filter_rebuild_drops_old_ids(tmp_path):
+    bloom = IdBloomFilter(str(tmp_path / "ids.bloom"), capacity=1000)
+    try:
+        bloom.rebuild(["2401.00001"], 1)
+        bloom.rebuild(["2401.00002"], 2)
+        assert "2401.00001" not in bloom
+        assert "2401.00002" in bloom
+    finally:
+        bloom.close()
+
+
+def test_bloom_filter_resets_when_capacity_changes(tmp_path):
+    path = str(tmp_path / "ids.bloom")
+    bloom = IdBloomFilter(path, capacity=1000)
+    bloom.rebuild(["2401.00001"], 333)
+    bloom.close()
+
+    resized = IdBloomFilter(path, capacity=5000)
+    try:
+        assert resized.source_mtime() == 0
+        assert "2401.00001" not in resized
+    finally:
+        resized.close()
+
+
+def test_article_index_rebuild_and_add(tmp_path):
+    index = ArticleIndex(str(tmp_path / "index.sqlite"))
+    try:
+        assert index.source_mtime() is None
+        index.rebuild([{"paper_id": "2401.00001"}, {"url": "https://arxiv.org/abs/2401.00002"}, {"title": "x"}], 5)
+        index.add([{"paper_id": "2401.00003"}], 6)
+
+        assert sorted(index.paper_ids()) == ["2401.00001", "2401.00002", "2401.00003"]
+        assert index.has("2401.00002")
+        assert not index.has("2401.00004")
+        assert index.source_mtime() == 6
+    finally:
+        index.close()
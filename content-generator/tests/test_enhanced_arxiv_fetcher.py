@@ -0,0 +1,153 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+import enhanced_arxiv_fetcher
+from enhanced_arxiv_fetcher import ArxivEntry, EnhancedArxivFetcher
+
+NOW = 1_750_000_000
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>arXiv Query</title>
+  <entry>
+    <id>http://arxiv.org/abs/2401.00001v2</id>
+    <updated>2024-01-03T10:00:00Z</updated>
+    <published>2024-01-01T09:30:00Z</published>
+    <title>Sparse   Attention
+      for Long Sequences</title>
+    <summary>  We study transformers.  </summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+    <link href="http://arxiv.org/abs/2401.00001v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.00001v2" rel="related" type="application/pdf"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/api/errors#incorrect_id_format_for_1234</id>
+    <title>Error</title>
+    <summary>incorrect id format for 1234</summary>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2401.00002v1</id>
+    <published>2024-01-02T00:00:00Z</published>
+    <title>Second</title>
+    <summary>Short.</summary>
+  </entry>
+</feed>
+"""
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with EnhancedArxivFetcher() as fetcher:
+        yield fetcher
+
+
+def test_parse_atom_reads_entries(fetcher):
+    entries = fetcher._parse_atom(FEED)
+
+    assert [entry.entry_id for entry in entries] == [
+        "http://arxiv.org/abs/2401.00001v2",
+        "http://arxiv.org/abs/2401.00002v1",
+    ]
+    first = entries[0]
+    assert first.title == "Sparse Attention for Long Sequences"
+    assert first.summary == "We study transformers."
+    assert first.authors == ["Ada Lovelace", "Alan Turing"]
+    assert first.categories == ["cs.LG", "cs.CL"]
+    assert first.pdf_url == "http://arxiv.org/pdf/2401.00001v2"
+    assert first.published == datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+    assert first.published_ts == int(first.published.timestamp())
+    assert first.updated == datetime(2024, 1, 3, 10, 0, tzinfo=timezone.utc)
+
+
+def test_parse_atom_skips_entries_without_published_date(fetcher):
+    entries = fetcher._parse_atom(FEED)
+
+    assert all("errors" not in entry.entry_id for entry in entries)
+    assert entries[1].updated is None
+    assert entries[1].pdf_url is None
+
+
+def _random_feeds(seed: int):
+    """Three overlapping feeds of entries spread over the last 20 days."""
+    rng = random.Random(seed)
+    words = ["transformer", "attention", "diffusion", "graph", "robot", "protein", "reinforcement learning",
+             "language model", "benchmark", "survey", "neural network", "quantum"]
+    categories = ["cs.AI", "cs.LG", "cs.CV", "cs.CL", "cs.NE", "stat.ML", "cs.RO", "q-bio.BM"]
+    pool = []
+    for i in range(120):
+        published = NOW - rng.randrange(20 * 86400)
+        pool.append(ArxivEntry(
+            entry_id=f"http://arxiv.org/abs/2401.{i:05d}v1",
+            title=" ".join(rng.sample(words, 3)),
+            authors=["A. Author"],
+            summary=" ".join(rng.choice(words) for _ in range(rng.randrange(10, 200))),
+            published=datetime.fromtimestamp(published, timezone.utc),
+            published_ts=published,
+            updated=None,
+            categories=rng.sample(categories, rng.randrange(1, 4)),
+            pdf_url=None,
+        ))
+    return [rng.sample(pool, 60) for _ in range(3)]
+
+
+def _sort_and_dedupe(fetcher, feeds, max_results, days_back):
+    """The selection search_recent_papers made before the heap: dedupe, full sort, slice."""
+    start_ts = NOW - days_back * 86400
+    unique = {}
+    for entries in feeds:
+        for result in entries:
+            if result.published_ts >= start_ts and result.entry_id not in unique:
+                unique[result.entry_id] = result
+    scored = [(fetcher._calculate_relevance_score(result, NOW), result) for result in unique.values()]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [(result.entry_id, score) for score, result in scored[:max_results]]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_results", [1, 5, 12, 500])
+def test_heap_selection_matches_sort_and_dedupe(fetcher, monkeypatch, seed, max_results):
+    feeds = _random_feeds(seed)
+
+    async def search_all(params_list):
+        return feeds[:len(params_list)]
+
+    monkeypatch.setattr(enhanced_arxiv_fetcher.time, "time", lambda: NOW)
+    monkeypatch.setattr(fetcher, "_search_all", search_all)
+
+    papers = fetcher.search_recent_papers("robotics", max_results=max_results, days_back=7)
+
+    expected = _sort_and_dedupe(fetcher, feeds, max_results, days_back=7)
+    assert [(paper["entry_id"], paper["relevance_score"]) for paper in papers] == expected
+
+
+def test_heap_selection_with_no_results(fetcher, monkeypatch):
+    async def search_all(params_list):
+        return _random_feeds(0)
+
+    monkeypatch.setattr(fetcher, "_search_all", search_all)
+
+    assert fetcher.search_recent_papers(max_results=0) == []
+
+
+def test_search_all_isolates_failing_queries(fetcher, monkeypatch):
+    async def fetch_atom(session, params):
+        if params["search_query"] == "bad":
+            raise RuntimeError("boom")
+        if params["search_query"] == "garbled":
+            return "<feed"
+        return FEED
+
+    monkeypatch.setattr(fetcher, "_fetch_atom", fetch_atom)
+
+    results = asyncio.run(fetcher._search_all([
+        {"search_query": "bad"}, {"search_query": "garbled"}, {"search_query": "good"},
+    ]))
+
+    assert [len(entries) for entries in results] == [0, 0, 2]